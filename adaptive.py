@@ -0,0 +1,163 @@
+import bisect
+import math
+import random
+
+# Rasch (1PL) item difficulty in logits for each bank difficulty label
+DIFFICULTY_LOGITS = {
+    "Easy": -1.0,
+    "Moderate": 0.0,
+    "Medium": 0.0,
+    "Hard": 1.0,
+}
+
+# Answers after which an item's own history outweighs its label
+CALIBRATION_WEIGHT = 20
+
+# Stopping rule: at least MIN_ITEMS, then stop once the standard error of
+# the ability estimate drops below SE_TARGET (or at MAX_ITEMS)
+SE_TARGET = 0.3
+MIN_ITEMS = 15
+MAX_ITEMS = 120
+
+PRIOR_SD = 1.0
+
+# Next item is drawn from this many of the most informative unused items,
+# so the same ability does not always get the same questions
+RANDOMESQUE = 5
+
+
+def calibrate(label, answered=0, correct=0):
+    # Label prior, shrunk towards the observed miss rate as answers build up
+    prior = DIFFICULTY_LOGITS.get(label, 0.0)
+    if not answered:
+        return prior
+
+    miss_rate = (answered - correct + 0.5) / (answered + 1)
+    observed = math.log(miss_rate / (1 - miss_rate))
+
+    return (prior * CALIBRATION_WEIGHT + observed * answered) / (CALIBRATION_WEIGHT + answered)
+
+
+class ItemPool:
+    # Bank items sorted by difficulty, so the item closest to an ability
+    # (the most informative one under 1PL) is found by bisect instead of a
+    # scan over the bank.
+    def __init__(self, difficulties):
+        order = sorted(difficulties, key=lambda i: (difficulties[i], i))
+
+        self.ids = tuple(order)
+        self.b = tuple(difficulties[i] for i in order)
+        self.difficulty = dict(difficulties)
+
+    @classmethod
+    def from_index(cls, index, tier=None, stats=None):
+        # Built from the QuestionIndex difficulty buckets; stats maps
+        # question id -> (answered, correct) from the responses history
+        stats = stats or {}
+        allowed = set(index.pool(tier))
+
+        difficulties = {}
+        for label, ids in index.by_difficulty.items():
+            for question_id in ids:
+                if question_id in allowed:
+                    difficulties[question_id] = calibrate(label, *stats.get(question_id, (0, 0)))
+
+        return cls(difficulties)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def nearest(self, theta, used, rng, k=RANDOMESQUE):
+        if not self.b:
+            return None
+
+        # Closest difficulty value, then a random start inside its run of
+        # equal difficulties so ties do not always resolve to the same ids
+        i = bisect.bisect_left(self.b, theta)
+        if i == len(self.b) or (i > 0 and theta - self.b[i - 1] <= self.b[i] - theta):
+            i -= 1
+
+        value = self.b[i]
+        start = rng.randrange(
+            bisect.bisect_left(self.b, value), bisect.bisect_right(self.b, value)
+        )
+
+        # Walk outwards by distance from theta, collecting k unused items
+        lo, hi = start - 1, start
+        found = []
+
+        while len(found) < k and (lo >= 0 or hi < len(self.b)):
+            if hi >= len(self.b) or (lo >= 0 and theta - self.b[lo] <= self.b[hi] - theta):
+                i, lo = lo, lo - 1
+            else:
+                i, hi = hi, hi + 1
+
+            if self.ids[i] not in used:
+                found.append(self.ids[i])
+
+        return rng.choice(found) if found else None
+
+    def expected_score(self, theta):
+        # Expected percentage correct over the whole pool at this ability
+        if not self.b:
+            return 0.0
+        return 100 * sum(1 / (1 + math.exp(b - theta)) for b in self.b) / len(self.b)
+
+
+class AbilityEstimate:
+    # Rasch ability with a normal prior, updated in O(1) per answer: the
+    # posterior is kept as N(theta, 1 / information) and each response adds
+    # its Fisher information and moves theta by the scaled residual.
+    __slots__ = ("theta", "information", "answered")
+
+    def __init__(self):
+        self.theta = 0.0
+        self.information = 1 / PRIOR_SD ** 2
+        self.answered = 0
+
+    @property
+    def se(self):
+        return 1 / math.sqrt(self.information)
+
+    def update(self, b, correct):
+        p = 1 / (1 + math.exp(b - self.theta))
+
+        self.information += p * (1 - p)
+        self.theta += ((1.0 if correct else 0.0) - p) / self.information
+        self.answered += 1
+
+
+class AdaptiveTest:
+    # Per-session CAT state: the running estimate plus the items already used
+    __slots__ = ("pool", "estimate", "used", "rng", "max_items")
+
+    def __init__(self, pool, seed=None, max_items=MAX_ITEMS):
+        self.pool = pool
+        self.estimate = AbilityEstimate()
+        self.used = set()
+        self.rng = random.Random(seed)
+        self.max_items = max_items
+
+    def record(self, question_id, correct):
+        self.estimate.update(self.pool.difficulty[question_id], correct)
+
+    def done(self):
+        answered = self.estimate.answered
+
+        if answered >= self.max_items or answered >= len(self.pool):
+            return True
+
+        return answered >= MIN_ITEMS and self.estimate.se < SE_TARGET
+
+    def next_item(self):
+        if self.done():
+            return None
+
+        question_id = self.pool.nearest(self.estimate.theta, self.used, self.rng)
+        if question_id is not None:
+            self.used.add(question_id)
+
+        return question_id
+
+    def readiness(self):
+        return self.pool.expected_score(self.estimate.theta)
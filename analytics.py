@@ -0,0 +1,161 @@
+import threading
+
+from database import LOCAL_USER, get_analytics_summary, get_attempts_page, get_attempts_version
+
+# ---------------- VIEW MODELS ----------------
+# What the Analytics tab shows, computed once from the attempt summary.
+# Plain dicts (None without attempts), so they cache and share freely across
+# pages; formatting and colors are left to the screens.
+TOTAL_DOMAINS = 10
+
+
+def practice_view(summary):
+    if not summary:
+        return None
+
+    recent = summary["recent"]
+
+    return {
+        "attempts": summary["attempts"],
+        "lifetime_avg": summary["lifetime_avg"],
+        "best_score": summary["best_score"],
+        "recent": recent,
+        "last_5_avg": sum(recent) / len(recent),
+    }
+
+
+def mock_view(summary):
+    view = practice_view(summary)
+    if view is None:
+        return None
+
+    lifetime_avg = view["lifetime_avg"]
+    last_5 = view["recent"]
+    last_5_avg = view["last_5_avg"]
+
+    # ---------------- DOMAIN AGGREGATION ----------------
+    averaged_domains = summary["domain_averages"]
+
+    if averaged_domains:
+        strongest_domain = max(averaged_domains, key=averaged_domains.get)
+        weakest_domain = min(averaged_domains, key=averaged_domains.get)
+    else:
+        strongest_domain = "N/A"
+        weakest_domain = "N/A"
+
+    # ---------------- PERFORMANCE TREND ----------------
+    if last_5_avg > lifetime_avg:
+        performance_pattern = "Improving 📈"
+    elif last_5_avg < lifetime_avg:
+        performance_pattern = "Declining 📉"
+    else:
+        performance_pattern = "Stable ➖"
+
+    # ---------------- CONSISTENCY SCORE ----------------
+    if len(last_5) > 1:
+        variance = sum((x - last_5_avg) ** 2 for x in last_5) / len(last_5)
+        stability_score = max(0, 100 - variance)
+    else:
+        stability_score = 100
+
+    # ---------------- EXAM READINESS SCORE ----------------
+    domain_balance_score = (
+        sum(averaged_domains.values()) / len(averaged_domains)
+        if averaged_domains else 0
+    )
+
+    readiness_score = min(100, (
+        (last_5_avg * 0.5) +
+        (lifetime_avg * 0.3) +
+        (domain_balance_score * 0.2)
+    ))
+
+    # ---------------- WEAKNESS SEVERITY ----------------
+    weakest_percent = averaged_domains.get(weakest_domain, 0)
+
+    if weakest_percent < 50:
+        weakness_level = "Critical Weakness"
+    elif weakest_percent < 70:
+        weakness_level = "Moderate Weakness"
+    else:
+        weakness_level = "Minor Weakness"
+
+    # ---------------- SMART RECOMMENDATION ----------------
+    if readiness_score >= 80:
+        recommendation = "You are exam-ready. Focus on mock simulation endurance."
+    elif readiness_score >= 60:
+        recommendation = "Good progress. Strengthen weak domains and improve stability."
+    else:
+        recommendation = "Focus on fundamentals. Increase structured practice."
+
+    view.update({
+        "total_questions": summary["total_questions"],
+        "domains_attempted": len(averaged_domains),
+        "total_domains": TOTAL_DOMAINS,
+        "strongest_domain": strongest_domain,
+        "strongest_percent": averaged_domains.get(strongest_domain, 0),
+        "weakest_domain": weakest_domain,
+        "weakest_percent": weakest_percent,
+        "weakness_level": weakness_level,
+        "trend": performance_pattern,
+        "stability": stability_score,
+        "readiness": readiness_score,
+        "recommendation": recommendation,
+    })
+
+    return view
+
+
+VIEWS = {"Practice": practice_view, "Mock": mock_view}
+
+
+# ---------------- CACHE ----------------
+# Per user: the analytics views and the Results pages already read, each
+# stamped with the attempt count stored in analytics_summary when it was read.
+# Any worker that saves an attempt bumps that count, so a read whose stamp no
+# longer matches is recomputed; invalidate() just drops entries early.
+class AnalyticsCache:
+    def __init__(self):
+        self._entries = {}        # user_id -> {key: (stamp, value)}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id, key, compute):
+        # Stamp first: a save landing mid-compute only makes the entry miss
+        stamp = get_attempts_version()
+
+        with self._lock:
+            entry = self._entries.get(user_id, {}).get(key)
+
+        if entry is not None and entry[0] == stamp:
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        value = compute()
+
+        with self._lock:
+            self._entries.setdefault(user_id, {})[key] = (stamp, value)
+
+        return value
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+
+CACHE = AnalyticsCache()
+
+
+def analytics_view(mode, user_id=LOCAL_USER):
+    return CACHE.get(user_id, mode, lambda: VIEWS[mode](get_analytics_summary(mode)))
+
+
+def attempts_page(before_id=None, user_id=LOCAL_USER):
+    return CACHE.get(user_id, ("attempts", before_id), lambda: get_attempts_page(before_id))
+
+
+def invalidate(user_id=LOCAL_USER):
+    CACHE.invalidate(user_id)
@@ -0,0 +1,126 @@
+import asyncio
+import atexit
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import analytics
+import database
+import question_bank
+
+log = logging.getLogger(__name__)
+
+# ---------------- WRITER THREAD ----------------
+# Every write goes through one queue drained by one thread, so writes are
+# applied in submission order and never contend with each other for the
+# SQLite write lock. Reads run on the default executor; each executor thread
+# gets its own connection from database.get_connection().
+
+_write_queue = queue.Queue()
+_writer = None
+_writer_lock = threading.Lock()
+
+_STOP = object()
+
+
+def _writer_loop():
+    while True:
+        item = _write_queue.get()
+
+        if item is _STOP:
+            database.close_connection()
+            return
+
+        future, fn, args, kwargs = item
+
+        if not future.set_running_or_notify_cancel():
+            continue
+
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+
+
+def _ensure_writer():
+    global _writer
+
+    with _writer_lock:
+        if _writer is None or not _writer.is_alive():
+            _writer = threading.Thread(
+                target=_writer_loop, name="db-writer", daemon=True
+            )
+            _writer.start()
+
+
+def submit_write(fn, *args, **kwargs):
+    _ensure_writer()
+
+    future = Future()
+    _write_queue.put((future, fn, args, kwargs))
+
+    return future
+
+
+def shutdown():
+    if _writer is not None and _writer.is_alive():
+        _write_queue.put(_STOP)
+        _writer.join()
+
+
+atexit.register(shutdown)
+
+
+async def write(fn, *args, **kwargs):
+    return await asyncio.wrap_future(submit_write(fn, *args, **kwargs))
+
+
+async def read(fn, *args, **kwargs):
+    return await asyncio.to_thread(fn, *args, **kwargs)
+
+
+# ---------------- ASYNC API ----------------
+
+async def save_attempt(mode, score, total, domain_stats, responses=(), reviews=(),
+                       user_id=database.LOCAL_USER):
+    attempt_id = await write(database.save_attempt, mode, score, total, domain_stats, responses, reviews)
+
+    # Only once the attempt is committed, so no reader re-caches the old state
+    analytics.invalidate(user_id)
+    return attempt_id
+
+
+async def merge_progress(user_id, answered, right):
+    return await write(database.merge_progress, user_id, answered, right)
+
+
+def queue_reviews(rows):
+    # Fire-and-forget in one transaction, so sync handlers can call it;
+    # applied in order with every other write, and logged if it fails
+    future = submit_write(database.save_reviews, rows)
+    future.add_done_callback(_log_failure)
+    return future
+
+
+def _log_failure(future):
+    if not future.cancelled() and future.exception() is not None:
+        log.error("queued write failed", exc_info=future.exception())
+
+
+async def get_analytics_view(mode, user_id=database.LOCAL_USER):
+    # Cached views only cost the attempt-count check
+    return await read(analytics.analytics_view, mode, user_id)
+
+
+async def get_cached_attempts_page(before_id=None, user_id=database.LOCAL_USER):
+    return await read(analytics.attempts_page, before_id, user_id)
+
+
+async def search_questions(text, limit=question_bank.SEARCH_LIMIT, tier=None):
+    return await read(question_bank.search, text, limit, tier)
+
+
+async def get_due_reviews(limit, user_id=database.LOCAL_USER, include_pro=True):
+    return await read(database.get_due_reviews, time.time(), limit, user_id, include_pro)
@@ -0,0 +1,286 @@
+import argparse
+import hashlib
+import json
+import os
+import struct
+import sys
+from array import array
+
+# ---------------- VOCABULARY ----------------
+# PMP Exam Content Outline domains plus the PMBOK knowledge areas the bank
+# still uses
+CATEGORIES = (
+    "People",
+    "Process",
+    "Business Environment",
+    "Integration Management",
+    "Scope Management",
+    "Schedule Management",
+    "Cost Management",
+    "Quality Management",
+    "Resource Management",
+    "Communication Management",
+    "Risk Management",
+    "Procurement Management",
+    "Stakeholder Management",
+)
+
+DIFFICULTIES = ("Easy", "Moderate", "Medium", "Hard")
+
+OPTION_COUNT = 4
+
+# ---------------- ARTIFACT FORMAT ----------------
+# Little-endian. Header, then one record of string-table indexes per
+# question, then the string table: end offsets of every string followed by
+# one UTF-8 blob. Each distinct string is stored once, so category and
+# difficulty names cost nothing per question.
+#
+#   header   magic, version, question count, string count, sha256 of the
+#            source JSON
+#   records  uint32 x RECORD_FIELDS per question (string indexes)
+#   flags    uint8 x 2 per question: correct_answer, is_pro
+#   offsets  uint32 x string count (end of each string in the blob)
+#   blob     UTF-8 text
+MAGIC = b"PMQB"
+FORMAT_VERSION = 2
+HEADER = struct.Struct("<4sHII32s")
+
+# question, options..., explanation, category, difficulty, subcategory, key
+RECORD_FIELDS = 6 + OPTION_COUNT
+NO_STRING = 0xFFFFFFFF
+
+
+class BankError(ValueError):
+    def __init__(self, errors):
+        super().__init__(f"{len(errors)} invalid question(s):\n" + "\n".join(errors))
+        self.errors = errors
+
+
+def validate(questions):
+    # Every problem in the bank, as "#index: message" strings
+    errors = []
+    keys = {}
+
+    if not isinstance(questions, list):
+        return ["bank must be a JSON list of questions"]
+
+    for i, q in enumerate(questions):
+        def error(message):
+            errors.append(f"#{i}: {message}")
+
+        if not isinstance(q, dict):
+            error("not an object")
+            continue
+
+        if not isinstance(q.get("question"), str) or not q["question"].strip():
+            error("missing question text")
+
+        options = q.get("options")
+        if not isinstance(options, list) or len(options) != OPTION_COUNT:
+            error(f"needs exactly {OPTION_COUNT} options")
+        elif not all(isinstance(o, str) and o.strip() for o in options):
+            error("options must be non-empty strings")
+        elif len(set(options)) != len(options):
+            error("duplicate options")
+
+        answer = q.get("correct_answer")
+        if type(answer) is not int or not 0 <= answer < OPTION_COUNT:
+            error(f"correct_answer must be an index 0-{OPTION_COUNT - 1}, got {answer!r}")
+
+        if q.get("category") not in CATEGORIES:
+            error(f"unknown category {q.get('category')!r}")
+
+        if q.get("difficulty") not in DIFFICULTIES:
+            error(f"unknown difficulty {q.get('difficulty')!r}")
+
+        if "is_pro" in q and not isinstance(q["is_pro"], bool):
+            error(f"is_pro must be true or false, got {q['is_pro']!r}")
+
+        for key in ("explanation", "subcategory"):
+            if q.get(key) is not None and not isinstance(q[key], str):
+                error(f"{key} must be a string")
+
+        # Optional stable identity, kept across edits to the text
+        if "key" in q:
+            if not isinstance(q["key"], str) or not q["key"].strip():
+                error("key must be a non-empty string")
+            elif q["key"] in keys:
+                error(f"duplicate key {q['key']!r} (also #{keys[q['key']]})")
+            else:
+                keys[q["key"]] = i
+
+    return errors
+
+
+def compile_bank(questions, source_hash):
+    errors = validate(questions)
+    if errors:
+        raise BankError(errors)
+
+    strings = []
+    string_ids = {}
+
+    def intern(text):
+        if text is None:
+            return NO_STRING
+        if text not in string_ids:
+            string_ids[text] = len(strings)
+            strings.append(text)
+        return string_ids[text]
+
+    records = array("I")
+    flags = bytearray()
+
+    for q in questions:
+        records.extend((
+            intern(q["question"]),
+            *(intern(o) for o in q["options"]),
+            intern(q.get("explanation")),
+            intern(q["category"]),
+            intern(q["difficulty"]),
+            intern(q.get("subcategory")),
+            intern(q.get("key")),
+        ))
+        flags += bytes((q["correct_answer"], int(q.get("is_pro", False))))
+
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = array("I")
+    end = 0
+    for data in encoded:
+        end += len(data)
+        offsets.append(end)
+
+    if sys.byteorder != "little":
+        records.byteswap()
+        offsets.byteswap()
+
+    return b"".join((
+        HEADER.pack(MAGIC, FORMAT_VERSION, len(questions), len(strings), source_hash),
+        records.tobytes(),
+        bytes(flags),
+        offsets.tobytes(),
+        *encoded,
+    ))
+
+
+def _uint32s(view):
+    # Zero-copy on little-endian hosts, so a memory-mapped bank stays mapped
+    if sys.byteorder == "little":
+        return view.cast("I")
+
+    values = array("I")
+    values.frombytes(view)
+    values.byteswap()
+    return values
+
+
+class CompiledBank:
+    # Read side of the artifact: views over data (bytes or an mmap), and
+    # every string is decoded only when a question is asked for.
+    def __init__(self, data):
+        magic, version, count, string_count, source_hash = HEADER.unpack_from(data)
+
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError("not a compiled question bank (or an older format)")
+
+        view = memoryview(data)
+        offset = HEADER.size
+        self.count = count
+        self.source_hash = source_hash.hex()
+
+        self.records = _uint32s(view[offset:offset + 4 * RECORD_FIELDS * count])
+        offset += 4 * RECORD_FIELDS * count
+
+        self.flags = view[offset:offset + 2 * count]
+        offset += 2 * count
+
+        self.offsets = _uint32s(view[offset:offset + 4 * string_count])
+        offset += 4 * string_count
+
+        self.blob = view[offset:]
+
+    def __len__(self):
+        return self.count
+
+    def string(self, index):
+        if index == NO_STRING:
+            return None
+        start = self.offsets[index - 1] if index else 0
+        return str(self.blob[start:self.offsets[index]], "utf-8")
+
+    def question(self, i):
+        fields = self.records[i * RECORD_FIELDS:(i + 1) * RECORD_FIELDS]
+        q = {
+            "question": self.string(fields[0]),
+            "options": [self.string(f) for f in fields[1:1 + OPTION_COUNT]],
+            "correct_answer": self.flags[2 * i],
+            "category": self.string(fields[2 + OPTION_COUNT]),
+            "subcategory": self.string(fields[4 + OPTION_COUNT]),
+            "difficulty": self.string(fields[3 + OPTION_COUNT]),
+            "is_pro": bool(self.flags[2 * i + 1]),
+            "explanation": self.string(fields[1 + OPTION_COUNT]),
+        }
+
+        key = self.string(fields[5 + OPTION_COUNT])
+        if key is not None:
+            q["key"] = key
+        return q
+
+    def __iter__(self):
+        return (self.question(i) for i in range(self.count))
+
+
+def compiled_path(json_path):
+    return os.path.splitext(json_path)[0] + ".bank"
+
+
+def read_source_hash(path):
+    # Only the header, so checking an unchanged bank costs one small read
+    with open(path, "rb") as f:
+        magic, version, _, _, source_hash = HEADER.unpack(f.read(HEADER.size))
+
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError(f"{path} is not a compiled question bank (or an older format)")
+
+    return source_hash.hex()
+
+
+def load(path):
+    with open(path, "rb") as f:
+        return CompiledBank(f.read())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate questions.json and compile it to a binary bank")
+    parser.add_argument("path", nargs="?", default="questions.json")
+    parser.add_argument("-o", "--output", help="defaults to the JSON path with a .bank suffix")
+    parser.add_argument("--check", action="store_true", help="validate only")
+    args = parser.parse_args()
+
+    with open(args.path, "rb") as f:
+        raw = f.read()
+
+    questions = json.loads(raw)
+    errors = validate(questions)
+
+    if errors:
+        print("\n".join(errors), file=sys.stderr)
+        print(f"{len(errors)} problem(s) in {args.path}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.check:
+        print(f"{args.path}: {len(questions)} questions OK")
+        return
+
+    output = args.output or compiled_path(args.path)
+    data = compile_bank(questions, hashlib.sha256(raw).digest())
+
+    with open(output, "wb") as f:
+        f.write(data)
+
+    print(f"{args.path}: {len(questions)} questions OK -> {output} "
+          f"({len(data):,} bytes, JSON {len(raw):,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Adaptive mode: test length and accuracy vs. fixed random forms.
+
+Simulates examinees with known Rasch abilities answering a synthetic item
+bank through AdaptiveTest, then through random forms of the same length
+and of 180 items scored with the same estimator. Also times next-item
+selection (bisect) against a linear scan for growing bank sizes.
+
+    python benchmarks/bench_adaptive.py [--examinees 2000] [--items 1000]
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from adaptive import AbilityEstimate, AdaptiveTest, ItemPool  # noqa: E402
+
+
+def respond(rng, theta, b):
+    return rng.random() < 1 / (1 + math.exp(b - theta))
+
+
+def synthetic_pool(rng, n):
+    return ItemPool({i: rng.gauss(0, 1.2) for i in range(n)})
+
+
+def simulate_cat(pool, rng, theta):
+    test = AdaptiveTest(pool, seed=rng.random())
+
+    question_id = test.next_item()
+    while question_id is not None:
+        test.record(question_id, respond(rng, theta, pool.difficulty[question_id]))
+        question_id = test.next_item()
+
+    return test.estimate
+
+
+def simulate_fixed(pool, rng, theta, length):
+    estimate = AbilityEstimate()
+
+    for question_id in rng.sample(pool.ids, length):
+        b = pool.difficulty[question_id]
+        estimate.update(b, respond(rng, theta, b))
+
+    return estimate
+
+
+def linear_nearest(pool, theta, used):
+    best, best_distance = None, None
+    for question_id, b in zip(pool.ids, pool.b):
+        if question_id not in used and (best is None or abs(b - theta) < best_distance):
+            best, best_distance = question_id, abs(b - theta)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--examinees", type=int, default=2000)
+    parser.add_argument("--items", type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    pool = synthetic_pool(rng, args.items)
+    abilities = [rng.gauss(0, 1) for _ in range(args.examinees)]
+
+    def report(name, run):
+        start = time.perf_counter()
+        estimates = [run(theta) for theta in abilities]
+        elapsed = time.perf_counter() - start
+
+        lengths = [e.answered for e in estimates]
+        rmse = math.sqrt(sum((e.theta - t) ** 2 for e, t in zip(estimates, abilities)) / len(abilities))
+        print(f"{name:10} mean {sum(lengths) / len(lengths):6.1f} questions "
+              f"(min {min(lengths)}, max {max(lengths)}), ability RMSE {rmse:.3f}, "
+              f"{elapsed * 1e3 / len(abilities):.2f} ms/examinee")
+        return round(sum(lengths) / len(lengths))
+
+    length = report("adaptive", lambda theta: simulate_cat(pool, rng, theta))
+    report(f"fixed {length}", lambda theta: simulate_fixed(pool, rng, theta, length))
+    report("fixed 180", lambda theta: simulate_fixed(pool, rng, theta, 180))
+
+    print("next-item selection")
+    for n in (1_000, 10_000, 100_000):
+        big = synthetic_pool(rng, n)
+        used = set(rng.sample(big.ids, 60))
+        thetas = [rng.gauss(0, 1) for _ in range(200)]
+
+        start = time.perf_counter()
+        for theta in thetas:
+            big.nearest(theta, used, rng)
+        indexed = (time.perf_counter() - start) / len(thetas)
+
+        start = time.perf_counter()
+        for theta in thetas[:20]:
+            linear_nearest(big, theta, used)
+        linear = (time.perf_counter() - start) / 20
+
+        print(f"  {n:>7} items   bisect {indexed * 1e6:8.2f} us   linear scan {linear * 1e6:10.2f} us")
+
+
+if __name__ == "__main__":
+    main()
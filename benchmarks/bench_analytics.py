@@ -0,0 +1,107 @@
+"""Results and Analytics tabs: time to show each tab and to switch the theme,
+rebuilt from the database every time vs. memoized in analytics.CACHE with
+the screens restyled in place.
+
+Runs in a temp directory whose database holds --attempts saved attempts,
+through the in-process Flet session from bench_quiz_render.py. "cold"
+clears the cache and the page's built screens before every step, which is
+what each visit cost before; "cached" keeps them. Reports the mean time per
+tab switch and per theme toggle, and the bytes sent per toggle.
+
+    python benchmarks/bench_analytics.py [--attempts 2000] [--rounds 20]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARKS))
+sys.path.insert(0, BENCHMARKS)
+
+from bench_quiz_render import in_temp_dir  # noqa: E402
+
+DOMAINS = ["People", "Process", "Business Environment"]
+
+
+def seed(attempts):
+    import database
+
+    database.init_db()
+    rng = random.Random(7)
+
+    for i in range(attempts):
+        stats = {d: {"correct": rng.randint(0, 10), "total": 10} for d in DOMAINS}
+        database.save_attempt("Mock" if i % 2 else "Practice", sum(s["correct"] for s in stats.values()), 30, stats)
+
+
+async def run(rounds, results):
+    import flet as ft
+    import analytics
+    from bench_quiz_render import controls, start_app
+
+    conn, page = await start_app()
+
+    found = list(controls(page, set()))
+    navigation = next(c for c in found if isinstance(c, ft.NavigationBar))
+    theme_switch = next(c for c in found if isinstance(c, ft.Switch))
+
+    async def timed(control, event, settle):
+        start = time.perf_counter()
+        await control._trigger_event(event, None)
+        elapsed = (time.perf_counter() - start) * 1e3
+        await asyncio.sleep(settle)
+        return elapsed
+
+    for label in ("cold", "cached"):
+        tabs, toggles, toggle_bytes = [], [], []
+
+        for _ in range(rounds):
+            for index in (1, 2):
+                if label == "cold":
+                    # Re-read and rebuilt on every visit, as before
+                    analytics.invalidate()
+
+                navigation.selected_index = index
+                tabs.append(await timed(navigation, "change", 0.15))
+
+                sent = conn.bytes
+                theme_switch.value = not theme_switch.value
+                toggle = await timed(theme_switch, "change", 0.05)
+
+                if label == "cold":
+                    # The old toggle rebuilt the open tab with the new colors
+                    analytics.invalidate()
+                    toggle += await timed(navigation, "change", 0.15)
+
+                toggles.append(toggle)
+                toggle_bytes.append(conn.bytes - sent)
+
+        results[label] = (
+            sum(tabs) / len(tabs), sum(toggles) / len(toggles), sum(toggle_bytes) / len(toggle_bytes)
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--attempts", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    results = {}
+
+    async def bench():
+        seed(args.attempts)
+        await run(args.rounds, results)
+
+    in_temp_dir(bench)
+
+    for label, (tab, toggle, sent) in results.items():
+        print(f"{label:<7} tab switch {tab:6.2f} ms   theme toggle {toggle:6.2f} ms   "
+              f"{sent / 1024:6.1f} KB per toggle")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Cold-start cost of the question bank: JSON source vs. compiled artifact.
+
+For the shipped bank and larger synthetic ones (copies of questions.json
+with numbered text), times build_bank() on a fresh database (first launch:
+read, validate, import) and on an already imported one (every later
+launch: is the bank unchanged?), once from the JSON and once from the
+bank_compiler artifact. Also times a full parse of each format.
+
+    python benchmarks/bench_cold_start.py [--sizes 274 5000 30000]
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bank_compiler  # noqa: E402
+import database  # noqa: E402
+import question_bank  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def synthetic_bank(source, n):
+    return [
+        dict(source[i % len(source)], question=f"{source[i % len(source)]['question']} (#{i})")
+        for i in range(n)
+    ]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1e3
+
+
+def launches(directory, json_path, artifact=None):
+    # (first launch, later launch) in ms, from the JSON alone or with the
+    # artifact placed next to it
+    compiled = bank_compiler.compiled_path(json_path)
+    if os.path.exists(compiled):
+        os.remove(compiled)
+
+    if artifact is not None:
+        shutil.copy(artifact, compiled)
+        os.utime(compiled, None)   # newer than the JSON
+
+    database.close_connection()
+    database.DB_NAME = os.path.join(directory, f"bank-{time.perf_counter_ns()}.db")
+    database.init_db()
+
+    first = timed(lambda: question_bank.build_bank(json_path))
+    later = timed(lambda: question_bank.build_bank(json_path))
+
+    return first, later
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[274, 5000, 30000])
+    args = parser.parse_args()
+
+    with open(os.path.join(ROOT, "questions.json"), encoding="utf-8") as f:
+        source = json.load(f)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "questions.json")
+
+        for n in args.sizes:
+            bank = source if n == len(source) else synthetic_bank(source, n)
+            raw = json.dumps(bank).encode()
+            with open(json_path, "wb") as f:
+                f.write(raw)
+
+            artifact = os.path.join(tmp, "artifact.bank")
+            data = bank_compiler.compile_bank(bank, hashlib.sha256(raw).digest())
+            with open(artifact, "wb") as f:
+                f.write(data)
+
+            json_first, json_later = launches(tmp, json_path)
+            bank_first, bank_later = launches(tmp, json_path, artifact)
+
+            parse_json = timed(lambda: bank_compiler.validate(json.loads(raw)))
+            parse_bank = timed(lambda: bank_compiler.load(artifact))
+
+            print(f"{n:>6} questions   JSON {len(raw) / 1024:8.0f} KB   compiled {len(data) / 1024:8.0f} KB")
+            print(f"         later launch  JSON {json_later:8.2f} ms   compiled {bank_later:8.2f} ms")
+            print(f"         first launch  JSON {json_first:8.2f} ms   compiled {bank_first:8.2f} ms")
+            print(f"         parse         JSON {parse_json:8.2f} ms   compiled {parse_bank:8.2f} ms "
+                  f"(JSON parse + validate vs. artifact load)")
+
+        database.close_connection()
+
+
+if __name__ == "__main__":
+    main()
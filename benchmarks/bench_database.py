@@ -0,0 +1,105 @@
+"""Attempts/sec for save_attempt, and reading every attempt back.
+
+Compares the old open-per-call pattern against the pooled WAL connection.
+
+    python benchmarks/bench_database.py [--n 2000]
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database  # noqa: E402
+
+
+DOMAIN_STATS = {
+    "People": {"correct": 18, "total": 25},
+    "Process": {"correct": 30, "total": 45},
+    "Business Environment": {"correct": 6, "total": 10},
+}
+
+
+# ---------------- BASELINE (connect / commit / close per call) ----------------
+
+def legacy_save_attempt(db_name, mode, score, total, domain_stats):
+    conn = sqlite3.connect(db_name)
+    cursor = conn.cursor()
+    cursor.execute("""
+        INSERT INTO attempts (date, mode, score, total, percentage, domain_stats)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, (
+        datetime.now().strftime("%Y-%m-%d %H:%M"),
+        mode, score, total, (score / total) * 100, json.dumps(domain_stats)
+    ))
+    conn.commit()
+    conn.close()
+
+
+def legacy_get_attempts(db_name):
+    conn = sqlite3.connect(db_name)
+    rows = conn.execute(
+        "SELECT date, mode, score, total, percentage, domain_stats FROM attempts"
+    ).fetchall()
+    conn.close()
+    return [
+        {
+            "date": row[0], "mode": row[1], "score": row[2], "total": row[3],
+            "percentage": row[4],
+            "domain_stats": json.loads(row[5]) if row[5] else {}
+        }
+        for row in rows
+    ]
+
+
+def timed(label, n, fn):
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {n / elapsed:>10.0f} ops/sec  ({elapsed * 1e6 / n:.1f} us/op)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_db = os.path.join(tmp, "legacy.db")
+        pooled_db = os.path.join(tmp, "pooled.db")
+
+        conn = sqlite3.connect(legacy_db)
+        conn.execute("""
+            CREATE TABLE attempts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                date TEXT, mode TEXT, score INTEGER, total INTEGER,
+                percentage REAL, domain_stats TEXT
+            )
+        """)
+        conn.close()
+
+        print(f"save_attempt x {args.n}")
+        timed("  before (connect per call)", args.n,
+              lambda: legacy_save_attempt(legacy_db, "Mock", 54, 80, DOMAIN_STATS))
+
+        database.DB_NAME = pooled_db
+        database.init_db()
+        timed("  after (pooled WAL)", args.n,
+              lambda: database.save_attempt("Mock", 54, 80, DOMAIN_STATS))
+
+        reads = max(1, args.n // 100)
+        print(f"read all attempts x {reads} ({args.n} rows)")
+        timed("  before (connect per call)", reads, lambda: legacy_get_attempts(legacy_db))
+        timed("  after (pooled WAL)", reads, lambda: database.get_attempts_page(None, args.n))
+
+        database.close_connection()
+
+
+if __name__ == "__main__":
+    main()
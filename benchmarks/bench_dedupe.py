@@ -0,0 +1,89 @@
+"""Near-duplicate detection: MinHash/LSH vs. all-pairs Jaccard.
+
+Builds synthetic banks by recombining questions.json text, plants lightly
+edited copies of some questions, then times dedupe.find_duplicates() (with
+and without the process pool) and checks how many planted pairs it finds.
+All-pairs Jaccard is timed on the smallest bank only.
+
+    python benchmarks/bench_dedupe.py [--sizes 1000 10000 20000] [--planted 0.02]
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import dedupe  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def synthetic_bank(source, n, planted, rng):
+    words = [w for q in source for w in re.findall(r"[A-Za-z]+", q["question"])]
+
+    def sentence(length):
+        return " ".join(rng.choice(words) for _ in range(length)).capitalize()
+
+    bank = [
+        {"question": sentence(rng.randint(10, 22)) + "?",
+         "options": [sentence(rng.randint(2, 5)) for _ in range(4)]}
+        for _ in range(n)
+    ]
+
+    # Near-duplicates: one word swapped and a short suffix appended
+    pairs = []
+    for i in rng.sample(range(n), int(n * planted)):
+        copy = json.loads(json.dumps(bank[i]))
+        text = copy["question"].split()
+        text[rng.randrange(len(text))] = rng.choice(words)
+        copy["question"] = " ".join(text) + " Choose one."
+        pairs.append((i, len(bank)))
+        bank.append(copy)
+
+    return bank, pairs
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 20000])
+    parser.add_argument("--planted", type=float, default=0.02)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    with open(os.path.join(ROOT, "questions.json"), encoding="utf-8") as f:
+        source = json.load(f)
+
+    for n in args.sizes:
+        bank, planted = synthetic_bank(source, n, args.planted, rng)
+
+        timings = {}
+        for label, workers in (("1 process", 1), (f"{os.cpu_count()} processes", None)):
+            start = time.perf_counter()
+            clusters, pairs = dedupe.find_duplicates(bank, workers=workers)
+            timings[label] = time.perf_counter() - start
+
+        found = {(i, j) for i, j, _ in pairs}
+        recall = sum(pair in found for pair in planted) / len(planted)
+        times = ", ".join(f"{label} {t:.2f}s" for label, t in timings.items())
+        print(f"{len(bank):>6} questions   {times}   "
+              f"{len(clusters)} clusters, planted pairs found {recall:.0%}")
+
+        if n == min(args.sizes):
+            shingle_sets = [dedupe.shingles(dedupe.question_text(q)) for q in bank]
+            start = time.perf_counter()
+            exact = {
+                (i, j) for i, j in itertools.combinations(range(len(bank)), 2)
+                if dedupe.jaccard(shingle_sets[i], shingle_sets[j]) >= dedupe.SIMILARITY_THRESHOLD
+            }
+            brute = time.perf_counter() - start
+            print(f"{'':>6}             all-pairs Jaccard {brute:.2f}s, {len(exact)} pairs "
+                  f"(LSH found {len(found & exact)}); grows with the square of the bank")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Exam countdown for many concurrent timed sessions: one task per session
+(sleep one second, decrement a counter) vs. the shared exam_clock.ExamClock.
+
+Each timer renders its time left once per tick (a string format plus a
+short busy wait standing in for the control update) and records when it
+expired. Reports tasks alive, how late expiry came versus the real
+deadline, and CPU time used.
+
+    python benchmarks/bench_exam_clock.py [--sessions 1000] [--limit 5] [--render-us 100]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from exam_clock import ExamClock  # noqa: E402
+
+
+def render(remaining, cost):
+    # Stand-in for formatting and pushing timer_display
+    text = f"Time Left: {int(remaining) // 60:02}:{int(remaining) % 60:02}"
+    end = time.perf_counter() + cost
+    while time.perf_counter() < end:
+        pass
+    return text
+
+
+async def per_session_tasks(n, limit, cost):
+    lateness = []
+
+    async def countdown(deadline):
+        seconds = limit
+        while seconds > 0:
+            render(seconds, cost)
+            await asyncio.sleep(1)
+            seconds -= 1
+        lateness.append(time.monotonic() - deadline)
+
+    start = time.monotonic()
+    tasks = [asyncio.create_task(countdown(start + limit)) for _ in range(n)]
+    await asyncio.sleep(0)
+    alive = len(asyncio.all_tasks()) - 1
+    await asyncio.gather(*tasks)
+
+    return alive, lateness
+
+
+async def shared_clock(n, limit, cost):
+    clock = ExamClock()
+    lateness = []
+    done = asyncio.Event()
+
+    def expired(deadline):
+        lateness.append(time.monotonic() - deadline)
+        if len(lateness) == n:
+            done.set()
+
+    start = time.monotonic()
+    for i in range(n):
+        deadline = start + limit
+        clock.add(i, deadline, lambda remaining: render(remaining, cost),
+                  lambda deadline=deadline: expired(deadline))
+
+    await asyncio.sleep(0)
+    alive = len(asyncio.all_tasks()) - 1
+    await done.wait()
+
+    return alive, lateness
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=5, help="seconds per exam")
+    parser.add_argument("--render-us", type=float, default=100)
+    args = parser.parse_args()
+
+    cost = args.render_us / 1e6
+
+    for label, run in (("task per session", per_session_tasks), ("shared ExamClock", shared_clock)):
+        cpu = time.process_time()
+        alive, lateness = asyncio.run(run(args.sessions, args.limit, cost))
+        cpu = time.process_time() - cpu
+
+        lateness.sort()
+        print(f"{label:<17} {alive:>5} tasks   expiry late by p50 {lateness[len(lateness) // 2] * 1e3:7.1f} ms   "
+              f"max {lateness[-1] * 1e3:7.1f} ms   CPU {cpu:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Mock form assembly: the old per-category loops vs. StratifiedSampler.
+
+Generates N forms from the Pro pools of the current bank, checks every
+sampler form is exactly MOCK_EXAM_SIZE with no repeats, and that a fixed
+seed reproduces the same form.
+
+    python benchmarks/bench_exam_sampler.py [--forms 10000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database  # noqa: E402
+import question_bank  # noqa: E402
+from exam_sampler import ECO_BLUEPRINT, MOCK_EXAM_SIZE, WEAKEST_BOOST, StratifiedSampler  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def legacy_form(category_groups, weakest):
+    # The pre-sampler generate_adaptive_mock distribution and selection
+    num_categories = len(category_groups)
+    base_count = MOCK_EXAM_SIZE // num_categories
+    dist = {cat: base_count for cat in category_groups}
+
+    remainder = MOCK_EXAM_SIZE - (base_count * num_categories)
+    for i, cat in enumerate(dist):
+        if i < remainder:
+            dist[cat] += 1
+
+    if weakest and weakest in dist:
+        dist[weakest] += 10
+        for cat in dist:
+            if cat != weakest and dist[cat] > 5:
+                dist[cat] -= 1
+
+    selected = []
+    for cat, count in dist.items():
+        pool = category_groups[cat]
+        selected += random.sample(pool, min(count, len(pool)))
+
+    random.shuffle(selected)
+    return selected
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--forms", type=int, default=10000)
+    parser.add_argument("--bank", default=os.path.join(ROOT, "questions.json"))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DB_NAME = os.path.join(tmp, "bench.db")
+        question_bank.build_bank(args.bank)
+        pools = question_bank.get_index().categories(question_bank.TIER_PRO)
+        database.close_connection()
+
+    weakest = "Business Environment"
+    boosts = {weakest: WEAKEST_BOOST}
+    print("pro pool sizes:", {c: len(ids) for c, ids in pools.items()})
+
+    start = time.perf_counter()
+    sizes = [len(legacy_form(pools, weakest)) for _ in range(args.forms)]
+    legacy = time.perf_counter() - start
+    print(f"legacy loops   {args.forms} forms in {legacy:.2f}s "
+          f"({args.forms / legacy:.0f} forms/sec), size {min(sizes)}-{max(sizes)}")
+
+    start = time.perf_counter()
+    sampler = StratifiedSampler(pools)
+    quota = sampler.quotas(MOCK_EXAM_SIZE, ECO_BLUEPRINT, boosts)
+    forms = [sampler.assemble(MOCK_EXAM_SIZE, ECO_BLUEPRINT, boosts, seed=i) for i in range(args.forms)]
+    vectorized = time.perf_counter() - start
+    print(f"sampler        {args.forms} forms in {vectorized:.2f}s "
+          f"({args.forms / vectorized:.0f} forms/sec)")
+    print("quota:", dict(zip(sampler.categories, quota.tolist())))
+
+    assert all(len(f) == MOCK_EXAM_SIZE and len(set(f)) == MOCK_EXAM_SIZE for f in forms)
+    assert sampler.assemble(MOCK_EXAM_SIZE, ECO_BLUEPRINT, boosts, seed=7) == forms[7]
+    print("all forms exact-size and unique; seeded forms reproducible")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Resident memory of the question bank: every question loaded vs. lazy_bank.
+
+Imports a synthetic bank (copies of questions.json with numbered text and
+long explanations) into a temp database and writes its category shards,
+then measures RSS in a fresh process for each case:
+
+    baseline  imports and the QuestionIndex the app builds at startup
+    eager     every question as a dict, as the shared question table held
+              once Adaptive and the pre-assembled mock forms had loaded
+    lazy      lazy_bank.LazyBank after a 25-question session (question,
+              options and explanation of each) and a 180-question mock
+
+Also times a question fetch from a cold shard, an LRU miss and an LRU hit.
+
+    python benchmarks/bench_lazy_bank.py [--questions 5000]
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database  # noqa: E402
+import lazy_bank  # noqa: E402
+import question_bank  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def synthetic_bank(source, n):
+    return [
+        dict(
+            source[i % len(source)],
+            question=f"{source[i % len(source)]['question']} (#{i})",
+            explanation=" ".join([source[i % len(source)]["explanation"]] * 4),
+        )
+        for i in range(n)
+    ]
+
+
+def rss_kb():
+    # (anonymous, file-backed) resident KB; mapped file pages can be dropped
+    # and re-read under memory pressure, anonymous ones cannot
+    with open("/proc/self/status") as f:
+        status = dict(line.split(":", 1) for line in f)
+    return int(status["RssAnon"].split()[0]), int(status["RssFile"].split()[0])
+
+
+def child(case, directory):
+    database.DB_NAME = os.path.join(directory, "bench.db")
+    question_bank.get_index()   # every case: the app builds it at startup
+    rng = random.Random(0)
+    keep = None
+
+    if case == "eager":
+        keep = {q["id"]: q for q in question_bank.get_questions()}
+
+    elif case == "lazy":
+        keep = lazy_bank.open_bank(os.path.join(directory, "shards"))
+        ids = rng.sample(range(len(keep)), 25 + 180)
+        for q in keep.get_many(ids):
+            q["question"], q["options"], q["explanation"]
+
+    print(*rss_kb(), len(keep or ()))
+
+
+def fetch_timings(directory):
+    bank = lazy_bank.open_bank(os.path.join(directory, "shards"))
+    rng = random.Random(1)
+
+    def timed(question_id):
+        start = time.perf_counter()
+        bank.question(question_id)
+        return (time.perf_counter() - start) * 1e6
+
+    cold = timed(rng.randrange(len(bank)))
+    misses = [timed(i) for i in rng.sample(range(len(bank)), 500)]
+    hits = [timed(i) for i in list(bank._hot)[-100:]]
+
+    return cold, sorted(misses)[len(misses) // 2], sorted(hits)[len(hits) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--questions", type=int, default=5000)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--dir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.dir)
+        return
+
+    with open(os.path.join(ROOT, "questions.json"), encoding="utf-8") as f:
+        bank = synthetic_bank(json.load(f), args.questions)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "questions.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(bank, f)
+
+        database.DB_NAME = os.path.join(tmp, "bench.db")
+        database.init_db()
+        question_bank.build_bank(path)
+
+        start = time.perf_counter()
+        lazy_bank.open_bank(os.path.join(tmp, "shards"))
+        shards = os.listdir(os.path.join(tmp, "shards"))
+        shard_bytes = sum(os.path.getsize(os.path.join(tmp, "shards", s)) for s in shards)
+        print(f"{args.questions} questions, {os.path.getsize(path) / 1024:.0f} KB JSON, "
+              f"{len(shards)} shards ({shard_bytes / 1024:.0f} KB) written in "
+              f"{time.perf_counter() - start:.2f}s")
+
+        rss = {}
+        for case in ("baseline", "eager", "lazy"):
+            out = subprocess.run(
+                [sys.executable, __file__, "--child", case, "--dir", tmp],
+                check=True, capture_output=True, text=True,
+            ).stdout.split()
+            rss[case] = int(out[0]), int(out[1])
+
+        anon, mapped = rss["baseline"]
+        print(f"  baseline  RSS anonymous {anon / 1024:6.1f} MB   file-backed {mapped / 1024:6.1f} MB")
+        for case in ("eager", "lazy"):
+            print(f"  {case:<8}  RSS anonymous +{(rss[case][0] - anon) / 1024:5.1f} MB   "
+                  f"file-backed +{(rss[case][1] - mapped) / 1024:5.1f} MB")
+
+        cold, miss, hit = fetch_timings(tmp)
+        print(f"  fetch  cold shard {cold:.0f} us   LRU miss p50 {miss:.1f} us   LRU hit p50 {hit:.1f} us")
+
+        database.close_connection()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Page updates per user action: messages and bytes sent for navigation.
+
+Same in-process Flet session as bench_quiz_render.py. Switches tabs,
+toggles the theme on each tab and runs a topic search, and reports what
+each action sent (including the content fade) and how long its handler
+took, then the UpdateScheduler's request and update counts.
+
+    python benchmarks/bench_page_updates.py [--repeat 5]
+"""
+import argparse
+import logging
+import os
+import statistics
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import flet as ft  # noqa: E402
+from bench_quiz_render import button, controls, in_temp_dir, measured, start_app  # noqa: E402
+
+SETTLE = 0.5   # past the 100 ms content fade
+
+
+def find(page, kind):
+    for control in controls(page, set()):
+        if isinstance(control, kind):
+            return control
+
+
+class LastRecord(logging.Handler):
+    record = None
+
+    def emit(self, record):
+        self.record = record
+
+
+async def run(repeat):
+    last = LastRecord()
+    logging.getLogger("update_scheduler").addHandler(last)
+    logging.getLogger("update_scheduler").setLevel(logging.DEBUG)
+
+    conn, page = await start_app()
+
+    navigation = find(page, ft.NavigationBar)
+    theme_switch = find(page, ft.Switch)
+    samples = {}
+
+    async def action(label, control, event, data=None):
+        samples.setdefault(label, []).append(await measured(conn, control, event, data, SETTLE))
+
+    async def select_tab(index):
+        navigation.selected_index = index
+        await action(("Home", "Results", "Analytics")[index] + " tab", navigation, "change", str(index))
+
+    async def toggle_theme(tab):
+        theme_switch.value = not theme_switch.value
+        await action(f"theme toggle on {tab}", theme_switch, "change", str(theme_switch.value).lower())
+
+    for _ in range(repeat):
+        for index, tab in enumerate(("Home", "Results", "Analytics")):
+            await select_tab(index)
+            await toggle_theme(tab)
+
+        await select_tab(0)
+        await action("open Study by Topic", button(page, "Study by Topic"), "click")
+
+        search = find(page, ft.TextField)
+        search.value = "risk register"
+        await action("topic search", search, "submit")
+
+    total_messages = total_bytes = 0
+    for label, values in samples.items():
+        messages = statistics.mean(v[1] for v in values)
+        sent = statistics.mean(v[0] for v in values)
+        total_messages += sum(v[1] for v in values)
+        total_bytes += sum(v[0] for v in values)
+        print(f"  {label:<26} {messages:4.1f} messages {sent:8.0f} bytes   "
+              f"handler p50 {statistics.median(v[2] for v in values):6.2f} ms")
+
+    actions = sum(len(v) for v in samples.values())
+    print(f"  {actions} actions: {total_messages} messages, {total_bytes / 1024:.0f} KB")
+
+    flushes, requested, collapsed = last.record.args
+    print(f"  scheduler (whole run): {requested} update requests, {flushes} updates sent, "
+          f"{collapsed} collapsed")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    in_temp_dir(lambda: run(args.repeat))
+
+
+if __name__ == "__main__":
+    main()
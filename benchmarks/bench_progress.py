@@ -0,0 +1,80 @@
+"""Seen/correct bitsets: practice sampling cost and storage per user.
+
+For synthetic banks of growing size with a user who has seen a share of
+the questions, times QuestionProgress.sample() and update(), compares
+sampling against the same priority order built with Python sets, and
+reports the BLOB size stored per user.
+
+    python benchmarks/bench_progress.py [--sizes 1000 10000 50000] [--seen 0.6]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from progress import QuestionProgress  # noqa: E402
+from question_bank import ids_to_mask  # noqa: E402
+
+K = 25
+
+
+def set_sample(pool, seen, correct, k, rng):
+    picked = []
+    for group in (
+        [i for i in pool if i not in seen],
+        [i for i in pool if i in seen and i not in correct],
+        [i for i in pool if i in correct],
+    ):
+        if len(picked) >= k:
+            break
+        picked += rng.sample(group, min(k - len(picked), len(group)))
+    return picked
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--seen", type=float, default=0.6)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+
+    for n in args.sizes:
+        pool = list(range(n))
+        pool_mask = ids_to_mask(pool)
+
+        history = [
+            (i, 0, int(rng.random() < 0.7), 0)
+            for i in rng.sample(pool, int(n * args.seen))
+        ]
+
+        progress = QuestionProgress()
+        update, _ = timed(lambda: progress.update(history[:K]), 200)
+        progress.update(history)
+
+        seen = {row[0] for row in history}
+        correct = {row[0] for row in history if row[2]}
+
+        bitset, picked = timed(lambda: progress.sample(pool_mask, K, rng), 50)
+        sets, _ = timed(lambda: set_sample(pool, seen, correct, K, rng), 10)
+
+        assert seen.isdisjoint(picked)   # enough unseen questions left
+        _, seen_blob, correct_blob = progress.row()
+
+        print(f"{n:>6} questions   sample {bitset * 1e3:7.3f} ms (sets {sets * 1e3:7.3f} ms)   "
+              f"update {update * 1e6:6.1f} us/session   "
+              f"stored {len(seen_blob) + len(correct_blob):>6} B/user")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Headless load test: many concurrent QuizEngine sessions, no Flet page.
+
+Starts N mock sessions over a synthetic 180-question form and answers them
+round-robin, the way interleaved users would, then finishes them all.
+
+    python benchmarks/bench_quiz_engine.py [--sessions 5000] [--questions 180]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quiz_engine import QuizEngine  # noqa: E402
+
+DOMAINS = ("People", "Process", "Business Environment")
+
+
+def synthetic_form(n):
+    return [
+        {
+            "id": i,
+            "question": f"Question {i}",
+            "options": ["A", "B", "C", "D"],
+            "correct_answer": i % 4,
+            "category": DOMAINS[i % len(DOMAINS)],
+            "explanation": "",
+        }
+        for i in range(n)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=5000)
+    parser.add_argument("--questions", type=int, default=180)
+    args = parser.parse_args()
+
+    form = synthetic_form(args.questions)
+    engine = QuizEngine()
+    engine.register_questions(form)
+    form_ids = [q["id"] for q in form]
+    rng = random.Random(0)
+
+    tracemalloc.start()
+
+    start = time.perf_counter()
+    sessions = [engine.start("Mock", form_ids) for _ in range(args.sessions)]
+    started = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+
+    start = time.perf_counter()
+    for _ in range(args.questions):
+        for session in sessions:
+            engine.answer(session, rng.randrange(4))
+            engine.advance(session)
+    answering = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = [engine.finish(session) for session in sessions]
+    finishing = time.perf_counter() - start
+
+    tracemalloc.stop()
+
+    answers = args.sessions * args.questions
+    print(f"{args.sessions} sessions x {args.questions} questions")
+    print(f"  start    {started * 1e6 / args.sessions:8.2f} us/session "
+          f"({peak / args.sessions:.0f} B/session before answering)")
+    print(f"  answer   {answering * 1e6 / answers:8.2f} us/answer "
+          f"({answers / answering:,.0f} answers/sec)")
+    print(f"  finish   {finishing * 1e6 / args.sessions:8.2f} us/session")
+    print(f"  mean score {sum(r['score'] for r in results) / len(results):.1f}"
+          f"/{args.questions}, active sessions left: {len(engine.sessions)}")
+
+
+if __name__ == "__main__":
+    main()
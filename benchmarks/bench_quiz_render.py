@@ -0,0 +1,157 @@
+"""Per-question cost of the quiz view: websocket bytes and handler latency.
+
+Runs main.main() against an in-process Flet session whose connection only
+encodes and counts outgoing messages (the same msgpack the websocket would
+carry), starts a Practice session and answers its questions. For each
+question, reports what Submit Answer and Continue sent and how long their
+handlers took, including Flet's automatic update after the event.
+
+Runs in a temp directory with a copy of questions.json, so the app's own
+database is left alone.
+
+    python benchmarks/bench_quiz_render.py
+"""
+import asyncio
+import concurrent.futures
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import flet as ft  # noqa: E402
+import msgpack  # noqa: E402
+from flet.controls.base_control import BaseControl  # noqa: E402
+from flet.controls.context import _context_page  # noqa: E402
+from flet.messaging.connection import Connection  # noqa: E402
+from flet.messaging.protocol import configure_encode_object_for_msgpack  # noqa: E402
+from flet.messaging.session import Session  # noqa: E402
+from flet.pubsub.pubsub_hub import PubSubHub  # noqa: E402
+
+SPLASH_WAIT = 2.0
+SETTLE = 0.05   # for updates flushed after the handler returns
+
+
+class CountingConnection(Connection):
+    def __init__(self, loop):
+        super().__init__()
+        self.loop = loop
+        self.executor = concurrent.futures.ThreadPoolExecutor()
+        self.pubsubhub = PubSubHub(loop, self.executor)
+        self.bytes = 0
+        self.messages = 0
+
+    def send_message(self, message):
+        encoded = msgpack.packb(
+            [message.action, message.body],
+            default=configure_encode_object_for_msgpack(BaseControl),
+        )
+        self.bytes += len(encoded)
+        self.messages += 1
+
+
+def controls(control, seen):
+    if control is None or id(control) in seen:
+        return
+    seen.add(id(control))
+    yield control
+
+    for attr in ("controls", "content"):
+        value = getattr(control, attr, None)
+        children = value if isinstance(value, list) else [value]
+        for child in children:
+            if isinstance(child, BaseControl):
+                yield from controls(child, seen)
+
+
+def button(page, label):
+    for control in controls(page, set()):
+        if isinstance(control, ft.ElevatedButton) and control.content == label and control.visible:
+            return control
+
+
+def session_length(page):
+    # From the progress line, "Practice | Question 1/25"
+    for control in controls(page, set()):
+        if isinstance(control, ft.Text) and control.value and "| Question 1/" in control.value:
+            return int(control.value.rsplit("/", 1)[1])
+
+
+def radio_group(page):
+    for control in controls(page, set()):
+        if isinstance(control, ft.RadioGroup):
+            return control
+
+
+async def measured(conn, control, event="click", data=None, settle=SETTLE):
+    # (bytes, messages, ms) for one event: the handler's time, and whatever
+    # was sent until settle seconds after it returned
+    sent, messages = conn.bytes, conn.messages
+    start = time.perf_counter()
+    await control._trigger_event(event, data)
+    elapsed = (time.perf_counter() - start) * 1e3
+    await asyncio.sleep(settle)
+    return conn.bytes - sent, conn.messages - messages, elapsed
+
+
+async def start_app():
+    import main as app
+
+    conn = CountingConnection(asyncio.get_running_loop())
+    session = Session(conn)
+    page = session.page
+    _context_page.set(page)
+
+    # Initial page, as sent when a client connects
+    msgpack.packb(session.get_page_patch(), default=configure_encode_object_for_msgpack(BaseControl))
+    session.start_updates_scheduler()
+
+    app.main(page)
+    await asyncio.sleep(SPLASH_WAIT)
+
+    return conn, page
+
+
+async def run():
+    conn, page = await start_app()
+
+    await button(page, "Practice Mode")._trigger_event("click", None)
+    await asyncio.sleep(0.3)
+
+    submits, continues = [], []
+
+    for _ in range(session_length(page)):
+        radio_group(page).value = "0"
+        submits.append(await measured(conn, button(page, "Submit Answer")))
+        continues.append(await measured(conn, button(page, "Continue")))
+
+    # The last Continue ends the session and renders the results
+    continues.pop()
+
+    for label, samples in (("Submit Answer", submits), ("Continue", continues)):
+        print(f"  {label:<14} {statistics.mean(s[0] for s in samples):8.0f} bytes   "
+              f"{statistics.mean(s[1] for s in samples):4.1f} messages   "
+              f"handler p50 {statistics.median(s[2] for s in samples):6.2f} ms   "
+              f"max {max(s[2] for s in samples):6.2f} ms")
+
+    per_question = sum(s[0] for s in submits[:len(continues)] + continues) / len(continues)
+    print(f"  per question   {per_question:8.0f} bytes over {len(continues)} questions")
+
+
+def in_temp_dir(run):
+    with tempfile.TemporaryDirectory() as tmp:
+        shutil.copy(os.path.join(ROOT, "questions.json"), tmp)
+        os.chdir(tmp)
+        asyncio.run(run())
+
+
+def main():
+    in_temp_dir(run)
+
+
+if __name__ == "__main__":
+    main()
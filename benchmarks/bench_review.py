@@ -0,0 +1,83 @@
+"""Spaced-repetition scheduler: per-answer update cost and due-list queries.
+
+Fills a temp database with a synthetic review schedule, then times
+ReviewScheduler.record() (the part that runs inline per answer), the
+indexed "next 25 due" query, and the same selection done by loading every
+row and sorting in Python.
+
+    python benchmarks/bench_review.py [--rows 100000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database  # noqa: E402
+import question_bank  # noqa: E402
+from review import DAY, REVIEW_SIZE, ReviewScheduler  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    now = time.time()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DB_NAME = os.path.join(tmp, "bench.db")
+        database.init_db()
+
+        # Due lists only name questions still in the bank
+        with database.get_connection() as conn:
+            question_bank.init_bank(conn)
+            conn.executemany(
+                "INSERT INTO questions (id, question, options, correct_answer, category) "
+                "VALUES (?, '', '[]', 0, '')",
+                ((i,) for i in range(args.rows))
+            )
+
+        scheduler = ReviewScheduler()
+
+        start = time.perf_counter()
+        rows = [
+            scheduler.record(i, rng.random() < 0.7, rng.uniform(5, 90),
+                             now - rng.uniform(0, 30 * DAY))
+            for i in range(args.rows)
+        ]
+        recorded = time.perf_counter() - start
+
+        database.save_reviews(rows)
+        print(f"{args.rows} scheduled questions")
+        print(f"  record()          {recorded * 1e6 / args.rows:8.2f} us/answer (inline SM-2 update)")
+
+        start = time.perf_counter()
+        for _ in range(100):
+            due = database.get_due_reviews(now, REVIEW_SIZE)
+        indexed = (time.perf_counter() - start) / 100
+
+        conn = database.get_connection()
+        start = time.perf_counter()
+        for _ in range(5):
+            states = conn.execute(database.SQL_SELECT_REVIEW_STATES, (database.LOCAL_USER,)).fetchall()
+            scanned = [row[0] for row in sorted(states, key=lambda row: row[4]) if row[4] <= now][:REVIEW_SIZE]
+        full = (time.perf_counter() - start) / 5
+
+        assert due == scanned
+        print(f"  next {REVIEW_SIZE} due, index {indexed * 1e3:8.3f} ms")
+        print(f"  next {REVIEW_SIZE} due, sort  {full * 1e3:8.3f} ms")
+
+        plan = conn.execute("EXPLAIN QUERY PLAN " + database.SQL_SELECT_DUE_REVIEWS,
+                            (database.LOCAL_USER, now, 1, REVIEW_SIZE)).fetchall()
+        print("  plan:", "; ".join(row[-1] for row in plan))
+
+        database.close_connection()
+
+
+if __name__ == "__main__":
+    main()
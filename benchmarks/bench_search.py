@@ -0,0 +1,107 @@
+"""Topic search latency on a large synthetic bank: FTS5 vs. a LIKE scan.
+
+Builds a bank of N questions by recombining the vocabulary of
+questions.json, imports it (including the FTS5 index) into a temp
+database, then times question_bank.search() for one- to three-word
+queries and compares a LIKE '%word%' scan over the same columns.
+
+    python benchmarks/bench_search.py [--questions 30000] [--queries 200]
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database  # noqa: E402
+import question_bank  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Every match, as ranking them would need
+SQL_LIKE = """
+    SELECT id FROM questions
+    WHERE question LIKE ? OR options LIKE ? OR explanation LIKE ?
+"""
+
+
+def synthetic_bank(source, n, rng):
+    words = [w for q in source for w in re.findall(r"[A-Za-z]+", q["question"] + " " + q["explanation"])]
+
+    def sentence(length):
+        return " ".join(rng.choice(words) for _ in range(length)).capitalize() + "."
+
+    return [
+        {
+            "question": sentence(rng.randint(10, 25)),
+            "options": [sentence(rng.randint(2, 6)) for _ in range(4)],
+            "correct_answer": rng.randrange(4),
+            "category": rng.choice(source)["category"],
+            "difficulty": rng.choice(("Easy", "Medium", "Hard")),
+            "is_pro": rng.random() < 0.8,
+            "explanation": sentence(rng.randint(15, 40)),
+        }
+        for _ in range(n)
+    ], sorted({w.lower() for w in words if len(w) > 3})
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p * len(values)))]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--questions", type=int, default=30000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    with open(os.path.join(ROOT, "questions.json"), encoding="utf-8") as f:
+        bank, vocabulary = synthetic_bank(json.load(f), args.questions, rng)
+
+    queries = [" ".join(rng.sample(vocabulary, rng.randint(1, 3))) for _ in range(args.queries)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "questions.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(bank, f)
+
+        database.DB_NAME = os.path.join(tmp, "bench.db")
+
+        start = time.perf_counter()
+        question_bank.build_bank(path)
+        print(f"{args.questions} questions imported and indexed in {time.perf_counter() - start:.2f}s")
+
+        timings = []
+        hits = 0
+        for query in queries:
+            start = time.perf_counter()
+            results = question_bank.search(query)
+            timings.append((time.perf_counter() - start) * 1e3)
+            hits += bool(results)
+
+        print(f"  fts5 search   p50 {percentile(timings, 0.5):6.2f} ms   p95 {percentile(timings, 0.95):6.2f} ms   "
+              f"max {max(timings):6.2f} ms   ({hits}/{len(queries)} queries with hits)")
+
+        conn = database.get_connection()
+        timings = []
+        for query in queries[:20]:
+            pattern = f"%{query.split()[0]}%"
+            start = time.perf_counter()
+            conn.execute(SQL_LIKE, (pattern, pattern, pattern)).fetchall()
+            timings.append((time.perf_counter() - start) * 1e3)
+
+        print(f"  LIKE scan     p50 {percentile(timings, 0.5):6.2f} ms   p95 {percentile(timings, 0.95):6.2f} ms   "
+              f"(first word only, not ranked)")
+
+        database.close_connection()
+
+
+if __name__ == "__main__":
+    main()
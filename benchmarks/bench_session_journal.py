@@ -0,0 +1,101 @@
+"""Per-answer cost of the mock exam session journal.
+
+Journals full 180-question mock sessions into a temp directory and times
+SessionJournal.record() with the default batched fsync, against an inline
+fsync after every answer. Then resumes each journal and checks the restored
+session matches the original.
+
+    python benchmarks/bench_session_journal.py [--sessions 20]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import session_journal  # noqa: E402
+from quiz_engine import QuizEngine  # noqa: E402
+from session_journal import SessionJournal  # noqa: E402
+
+DOMAINS = ("People", "Process", "Business Environment")
+QUESTIONS = 180
+
+
+def synthetic_form(n):
+    return [
+        {
+            "id": i,
+            "question": f"Question {i}",
+            "options": ["A", "B", "C", "D"],
+            "correct_answer": i % 4,
+            "category": DOMAINS[i % len(DOMAINS)],
+            "explanation": "",
+        }
+        for i in range(n)
+    ]
+
+
+def run(engine, form, directory, sessions, inline_fsync):
+    rng = random.Random(0)
+    elapsed = 0.0
+    finished = []
+
+    for _ in range(sessions):
+        session = engine.start("Mock", [q["id"] for q in form], time_limit=10800)
+        journal = SessionJournal.create(session, directory)
+
+        while not session.finished:
+            engine.answer(session, rng.randrange(4))
+
+            start = time.perf_counter()
+            journal.record(session)
+            if inline_fsync:
+                os.fsync(journal._fd)
+            elapsed += time.perf_counter() - start
+
+            engine.advance(session)
+
+        journal.close()
+        finished.append((session, journal.path))
+
+    return elapsed / (sessions * QUESTIONS), finished
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=20)
+    args = parser.parse_args()
+
+    form = synthetic_form(QUESTIONS)
+    engine = QuizEngine()
+    engine.register_questions(form)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        inline, _ = run(engine, form, os.path.join(tmp, "inline"), args.sessions, True)
+        batched, finished = run(engine, form, os.path.join(tmp, "batched"), args.sessions, False)
+
+        print(f"{args.sessions} mock sessions x {QUESTIONS} answers")
+        print(f"  fsync every answer      {inline * 1e6:9.2f} us/answer")
+        print(f"  batched (every {session_journal.FSYNC_EVERY:>2})     {batched * 1e6:9.2f} us/answer")
+
+        start = time.perf_counter()
+        for original, path in finished:
+            restored, journal = session_journal.resume(path, engine)
+            journal.close()
+
+            assert restored.index == original.index
+            assert restored.score == original.score
+            assert restored.domain_stats() == original.domain_stats()
+            assert restored.answers == original.answers
+        resumed = time.perf_counter() - start
+
+        size = os.path.getsize(finished[0][1])
+        print(f"  resume                  {resumed * 1e3 / len(finished):9.2f} ms/session "
+              f"({size} B journal per finished mock)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Per-session memory: the old list/dict session vs. the compact QuizSession.
+
+Holds N half-answered 180-question mock sessions in memory at once, for each
+representation in a fresh child process, and reports resident memory per
+session (RSS from /proc where available, tracemalloc otherwise) plus the
+serialized size of one session.
+
+    python benchmarks/bench_session_memory.py [--sessions 1000 10000 50000]
+"""
+import argparse
+import gc
+import os
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quiz_engine import QuizEngine  # noqa: E402
+
+DOMAINS = ("People", "Process", "Business Environment")
+QUESTIONS = 180
+
+
+def synthetic_form(n):
+    return [
+        {
+            "id": i,
+            "question": f"Question {i}",
+            "options": ["A", "B", "C", "D"],
+            "correct_answer": i % 4,
+            "category": DOMAINS[i % len(DOMAINS)],
+            "explanation": "",
+        }
+        for i in range(n)
+    ]
+
+
+class LegacySession:
+    # The pre-compaction session: its own question list, a domain dict of
+    # dicts and one response tuple per answer
+    def __init__(self, session_id, mode, questions):
+        self.id = session_id
+        self.mode = mode
+        self.questions = list(questions)
+        self.index = 0
+        self.score = 0
+        self.answered = False
+        self.domain_stats = {}
+        self.responses = []
+        self.shown_at = time.monotonic()
+
+
+def legacy_answer(session, selected):
+    question = session.questions[session.index]
+    correct = selected == question["correct_answer"]
+    stats = session.domain_stats.setdefault(question["category"], {"correct": 0, "total": 0})
+    stats["total"] += 1
+    if correct:
+        session.score += 1
+        stats["correct"] += 1
+    session.responses.append((
+        question["id"], selected, int(correct),
+        int((time.monotonic() - session.shown_at) * 1000)
+    ))
+    session.index += 1
+
+
+def rss():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def measure(kind, count):
+    form = synthetic_form(QUESTIONS)
+    rng = random.Random(0)
+    engine = QuizEngine()
+    engine.register_questions(form)
+
+    use_rss = rss() is not None
+    if not use_rss:
+        tracemalloc.start()
+
+    gc.collect()
+    before = rss() if use_rss else tracemalloc.get_traced_memory()[0]
+
+    sessions = []
+    for i in range(count):
+        if kind == "legacy":
+            session = LegacySession(i, "Mock", form)
+            for _ in range(QUESTIONS // 2):
+                legacy_answer(session, rng.randrange(4))
+        else:
+            session = engine.start("Mock", [q["id"] for q in form])
+            for _ in range(QUESTIONS // 2):
+                engine.answer(session, rng.randrange(4))
+                engine.advance(session)
+        sessions.append(session)
+
+    gc.collect()
+    after = rss() if use_rss else tracemalloc.get_traced_memory()[0]
+    source = "rss" if use_rss else "tracemalloc"
+    print(f"{(after - before) / count:.0f} {source}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--child", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        measure(args.child[0], int(args.child[1]))
+        return
+
+    print(f"{QUESTIONS}-question mock sessions, half answered")
+    for count in args.sessions:
+        row = []
+        for kind in ("legacy", "compact"):
+            out = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--child", kind, str(count)],
+                capture_output=True, text=True, check=True
+            ).stdout.split()
+            row.append(f"{kind} {float(out[0]):8.0f} B/session")
+        print(f"  {count:>6} sessions   " + "   ".join(row) + f"   ({out[1]})")
+
+    engine = QuizEngine()
+    form = synthetic_form(QUESTIONS)
+    engine.register_questions(form)
+    form_ids = [q["id"] for q in form]
+    practice = engine.start("Practice", form_ids[:25])
+    mock = engine.start("Mock", form_ids, time_limit=10800)
+    for session in (practice, mock):
+        while not session.finished:
+            engine.answer(session, 0)
+            engine.advance(session)
+
+    data = mock.to_bytes()
+    restored = engine.restore(data)
+    assert restored.domain_stats() == mock.domain_stats()
+    assert restored.response_rows() == [
+        (q, a, c, t // 100 * 100) for q, a, c, t in mock.response_rows()
+    ]
+    print(f"serialized: practice {len(practice.to_bytes())} B, mock {len(data)} B "
+          f"(round-trips through QuizEngine.restore)")
+
+
+if __name__ == "__main__":
+    main()
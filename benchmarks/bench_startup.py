@@ -0,0 +1,85 @@
+"""Time to first home screen: importing main.py and connecting pages.
+
+Each run is a fresh process in a temp directory holding a copy of
+questions.json. The first run has no database yet (first launch). The
+second run reuses it (every later launch). In each process, two pages
+connect one after the other through the in-process Flet session from
+bench_quiz_render.py. The second connect is what a warm web worker
+serves. Reports the import time, how long each page took to reach the
+home screen, and the STARTUP phase timings.
+
+    python benchmarks/bench_startup.py
+"""
+import asyncio
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCHMARKS)
+
+
+async def until_home(page):
+    from bench_quiz_render import button
+
+    start = time.perf_counter()
+    while button(page, "Practice Mode") is None:
+        await asyncio.sleep(0.005)
+    return (time.perf_counter() - start) * 1e3
+
+
+async def connect(app):
+    from bench_quiz_render import CountingConnection, Session, _context_page
+
+    session = Session(CountingConnection(asyncio.get_running_loop()))
+    _context_page.set(session.page)
+    session.start_updates_scheduler()
+
+    app.main(session.page)
+    return await until_home(session.page)
+
+
+def child():
+    sys.path.insert(0, ROOT)
+    sys.path.insert(0, BENCHMARKS)
+
+    start = time.perf_counter()
+    import main as app
+    imported = (time.perf_counter() - start) * 1e3
+
+    async def run():
+        return [await connect(app), await connect(app)]
+
+    first, second = asyncio.run(run())
+    print(json.dumps({
+        "import": imported, "first page": first, "next page": second,
+        "phases": app.STARTUP.timings,
+    }))
+
+
+def main():
+    if "--child" in sys.argv:
+        child()
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        shutil.copy(os.path.join(ROOT, "questions.json"), tmp)
+
+        for label in ("first launch", "later launch"):
+            out = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--child"],
+                cwd=tmp, check=True, capture_output=True, text=True,
+            ).stdout
+            result = json.loads(out.splitlines()[-1])
+
+            print(f"{label}: import {result['import']:.0f} ms, home screen after "
+                  f"{result['first page']:.0f} ms (first page), {result['next page']:.0f} ms (next page)")
+            print("  " + ", ".join(f"{name} {ms:.0f} ms" for name, ms in result["phases"].items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,71 +1,550 @@
 import sqlite3
+import threading
 from datetime import datetime
 import json
 
 DB_NAME = "pmp_app.db"
 
+# ---------------- CONNECTION SETTINGS ----------------
+# One long-lived connection per thread. WAL lets readers run while a
+# writer commits, and synchronous=NORMAL only fsyncs at checkpoints.
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-8000",       # ~8 MB page cache
+    "PRAGMA mmap_size=67108864",     # 64 MB memory-mapped I/O
+    "PRAGMA temp_store=MEMORY",
+)
+
+BUSY_TIMEOUT = 5.0
+STATEMENT_CACHE_SIZE = 128
+
+# ---------------- SQL ----------------
+# Kept as module constants so the exact same text is passed every time and
+# sqlite3's per-connection statement cache reuses the prepared statement.
+SQL_INSERT_ATTEMPT = """
+    INSERT INTO attempts (date, mode, score, total, percentage)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+SQL_INSERT_ATTEMPT_DOMAIN = """
+    INSERT INTO attempt_domains (attempt_id, domain, correct, total)
+    VALUES (?, ?, ?, ?)
+"""
+
+SQL_INSERT_RESPONSE = """
+    INSERT INTO responses (attempt_id, question_id, selected, correct, time_on_question_ms)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+# Keyset pagination, newest first. id grows with date, so "id < last seen id"
+# walks the history backwards through the primary key without OFFSET scans.
+SQL_SELECT_ATTEMPTS_PAGE = """
+    SELECT id, date, mode, score, total, percentage
+    FROM attempts
+    WHERE id < ?
+    ORDER BY id DESC
+    LIMIT ?
+"""
+
+ATTEMPTS_PAGE_SIZE = 50
+
+SQL_LATEST_DOMAIN_STATS = """
+    SELECT domain, correct, total
+    FROM attempt_domains
+    WHERE attempt_id = (SELECT MAX(id) FROM attempts)
+"""
+
+# Answer history per question, for calibrating item difficulty
+SQL_QUESTION_STATS = """
+    SELECT question_id, COUNT(*), SUM(correct)
+    FROM responses
+    GROUP BY question_id
+"""
+
+# ---------------- ANALYTICS SUMMARY ----------------
+# Running totals per mode, updated in the same transaction as the attempt
+# insert, so the Analytics tab never has to scan the attempts history.
+SQL_UPSERT_SUMMARY = """
+    INSERT INTO analytics_summary (mode, attempts, sum_percentage, max_percentage, total_questions)
+    VALUES (?, 1, ?, ?, ?)
+    ON CONFLICT(mode) DO UPDATE SET
+        attempts = attempts + 1,
+        sum_percentage = sum_percentage + excluded.sum_percentage,
+        max_percentage = MAX(max_percentage, excluded.max_percentage),
+        total_questions = total_questions + excluded.total_questions
+"""
+
+SQL_UPSERT_RECENT = """
+    INSERT OR REPLACE INTO recent_scores (mode, slot, percentage)
+    VALUES (?, ?, ?)
+"""
+
+SQL_UPSERT_DOMAIN_SUMMARY = """
+    INSERT INTO domain_summary (mode, domain, attempts, sum_percentage, correct, total)
+    VALUES (?, ?, 1, ?, ?, ?)
+    ON CONFLICT(mode, domain) DO UPDATE SET
+        attempts = attempts + 1,
+        sum_percentage = sum_percentage + excluded.sum_percentage,
+        correct = correct + excluded.correct,
+        total = total + excluded.total
+"""
+
+SQL_SELECT_SUMMARY = """
+    SELECT attempts, sum_percentage, max_percentage, total_questions
+    FROM analytics_summary
+    WHERE mode = ?
+"""
+
+SQL_ATTEMPTS_VERSION = "SELECT COALESCE(SUM(attempts), 0) FROM analytics_summary"
+
+SQL_SELECT_RECENT = "SELECT percentage FROM recent_scores WHERE mode = ?"
+
+SQL_SELECT_DOMAIN_SUMMARY = """
+    SELECT domain, sum_percentage / attempts
+    FROM domain_summary
+    WHERE mode = ?
+"""
+
+# ---------------- REVIEW SCHEDULE ----------------
+# Spaced-repetition state per user and question. (user_id, due) is indexed,
+# so the next k due items are an index range scan rather than a sort.
+LOCAL_USER = "local"
+
+SQL_UPSERT_REVIEW = """
+    INSERT INTO review_schedule (user_id, question_id, repetitions, interval_days, ease, due)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(user_id, question_id) DO UPDATE SET
+        repetitions = excluded.repetitions,
+        interval_days = excluded.interval_days,
+        ease = excluded.ease,
+        due = excluded.due
+"""
+
+SQL_SELECT_DUE_REVIEWS = """
+    SELECT r.question_id
+    FROM review_schedule r
+    JOIN questions q ON q.id = r.question_id
+    WHERE r.user_id = ? AND r.due <= ? AND q.is_pro <= ?
+    ORDER BY r.due
+    LIMIT ?
+"""
+
+SQL_SELECT_REVIEW_STATES = """
+    SELECT question_id, repetitions, interval_days, ease, due
+    FROM review_schedule
+    WHERE user_id = ?
+"""
+
+# ---------------- QUESTION PROGRESS ----------------
+# Seen / answered-correctly bitsets per user, one little-endian BLOB each
+SQL_UPSERT_PROGRESS = """
+    INSERT INTO user_progress (user_id, seen, correct)
+    VALUES (?, ?, ?)
+    ON CONFLICT(user_id) DO UPDATE SET
+        seen = excluded.seen,
+        correct = excluded.correct
+"""
+
+SQL_SELECT_PROGRESS = "SELECT seen, correct FROM user_progress WHERE user_id = ?"
+
+# Size of the last-N ring buffer kept per mode
+RECENT_WINDOW = 5
+
+# Bump when adding a step to migrate()
+SCHEMA_VERSION = 2
+
+_local = threading.local()
+
+
+def get_connection():
+    conn = getattr(_local, "conn", None)
+
+    # Reconnect if DB_NAME was switched (tests, benchmarks)
+    if conn is not None and _local.db_name == DB_NAME:
+        return conn
+
+    if conn is not None:
+        conn.close()
+
+    conn = sqlite3.connect(
+        DB_NAME,
+        timeout=BUSY_TIMEOUT,
+        cached_statements=STATEMENT_CACHE_SIZE,
+    )
+
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+
+    _local.conn = conn
+    _local.db_name = DB_NAME
+
+    return conn
+
+
+def close_connection():
+    conn = getattr(_local, "conn", None)
+
+    if conn is not None:
+        conn.close()
+        _local.conn = None
+
 
 def init_db():
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS attempts (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            date TEXT,
-            mode TEXT,
-            score INTEGER,
-            total INTEGER,
-            percentage REAL,
-            domain_stats TEXT
+    conn = get_connection()
+
+    with conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS attempts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                date TEXT,
+                mode TEXT,
+                score INTEGER,
+                total INTEGER,
+                percentage REAL,
+                domain_stats TEXT
+            )
+        """)
+
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS attempt_domains (
+                attempt_id INTEGER NOT NULL REFERENCES attempts(id),
+                domain TEXT NOT NULL,
+                correct INTEGER NOT NULL,
+                total INTEGER NOT NULL,
+                PRIMARY KEY (attempt_id, domain)
+            )
+        """)
+
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_attempts_mode_date ON attempts(mode, date)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_attempt_domains_domain ON attempt_domains(domain)"
         )
-    """)
 
-    conn.commit()
-    conn.close()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                attempt_id INTEGER NOT NULL REFERENCES attempts(id),
+                question_id INTEGER NOT NULL,
+                selected INTEGER,
+                correct INTEGER NOT NULL,
+                time_on_question_ms INTEGER
+            )
+        """)
+
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_responses_attempt ON responses(attempt_id)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_responses_question ON responses(question_id)"
+        )
+
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS analytics_summary (
+                mode TEXT PRIMARY KEY,
+                attempts INTEGER NOT NULL,
+                sum_percentage REAL NOT NULL,
+                max_percentage REAL NOT NULL,
+                total_questions INTEGER NOT NULL
+            )
+        """)
+
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS recent_scores (
+                mode TEXT NOT NULL,
+                slot INTEGER NOT NULL,
+                percentage REAL NOT NULL,
+                PRIMARY KEY (mode, slot)
+            )
+        """)
+
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS domain_summary (
+                mode TEXT NOT NULL,
+                domain TEXT NOT NULL,
+                attempts INTEGER NOT NULL,
+                sum_percentage REAL NOT NULL,
+                correct INTEGER NOT NULL,
+                total INTEGER NOT NULL,
+                PRIMARY KEY (mode, domain)
+            )
+        """)
+
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS review_schedule (
+                user_id TEXT NOT NULL,
+                question_id INTEGER NOT NULL,
+                repetitions INTEGER NOT NULL,
+                interval_days REAL NOT NULL,
+                ease REAL NOT NULL,
+                due REAL NOT NULL,
+                PRIMARY KEY (user_id, question_id)
+            ) WITHOUT ROWID
+        """)
+
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_review_schedule_due ON review_schedule(user_id, due)"
+        )
+
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS user_progress (
+                user_id TEXT PRIMARY KEY,
+                seen BLOB NOT NULL,
+                correct BLOB NOT NULL
+            )
+        """)
+
+        migrate(conn)
+
+
+def migrate(conn):
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
 
+    # ---------------- v1: JSON domain_stats -> attempt_domains ----------------
+    if version < 1:
+        rows = conn.execute(
+            "SELECT id, domain_stats FROM attempts WHERE domain_stats IS NOT NULL"
+        ).fetchall()
 
-def save_attempt(mode, score, total, domain_stats):
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
+        domain_rows = []
+        for attempt_id, raw in rows:
+            try:
+                domain_stats = json.loads(raw) if raw else {}
+            except ValueError:
+                continue
+
+            if not isinstance(domain_stats, dict):
+                continue
+
+            for domain, stats in domain_stats.items():
+                if not isinstance(stats, dict):
+                    continue
+                domain_rows.append((
+                    attempt_id,
+                    domain,
+                    stats.get("correct", 0),
+                    stats.get("total", 0)
+                ))
+
+        conn.executemany(
+            "INSERT OR IGNORE INTO attempt_domains (attempt_id, domain, correct, total) "
+            "VALUES (?, ?, ?, ?)",
+            domain_rows
+        )
+        # domain_stats stays as it was: new rows no longer write it, and a
+        # blob that failed to parse above is not lost
+
+    # ---------------- v2: build analytics summaries from history ----------------
+    if version < 2:
+        conn.execute("DELETE FROM analytics_summary")
+        conn.execute("DELETE FROM recent_scores")
+        conn.execute("DELETE FROM domain_summary")
+
+        conn.execute("""
+            INSERT INTO analytics_summary
+            SELECT mode, COUNT(*), SUM(percentage), MAX(percentage), SUM(total)
+            FROM attempts
+            GROUP BY mode
+        """)
+
+        conn.execute("""
+            INSERT INTO domain_summary
+            SELECT a.mode, d.domain, COUNT(*), SUM(100.0 * d.correct / d.total),
+                   SUM(d.correct), SUM(d.total)
+            FROM attempt_domains d
+            JOIN attempts a ON a.id = d.attempt_id
+            WHERE d.total > 0
+            GROUP BY a.mode, d.domain
+        """)
+
+        # Attempt #i of a mode lives in slot i % RECENT_WINDOW, so the next
+        # save overwrites the oldest entry.
+        modes = conn.execute("SELECT mode, attempts FROM analytics_summary").fetchall()
+        for mode, count in modes:
+            recent = conn.execute(
+                "SELECT percentage FROM attempts WHERE mode = ? ORDER BY id DESC LIMIT ?",
+                (mode, RECENT_WINDOW)
+            ).fetchall()
+
+            conn.executemany(SQL_UPSERT_RECENT, [
+                (mode, (count - 1 - i) % RECENT_WINDOW, percentage)
+                for i, (percentage,) in enumerate(recent)
+            ])
+
+    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+
+def update_summary(conn, mode, percentage, total, domain_stats):
+    conn.execute(SQL_UPSERT_SUMMARY, (mode, percentage, percentage, total))
+
+    count = conn.execute(SQL_SELECT_SUMMARY, (mode,)).fetchone()[0]
+    conn.execute(SQL_UPSERT_RECENT, (mode, (count - 1) % RECENT_WINDOW, percentage))
+
+    conn.executemany(SQL_UPSERT_DOMAIN_SUMMARY, [
+        (
+            mode,
+            domain,
+            (stats["correct"] / stats["total"]) * 100,
+            stats["correct"],
+            stats["total"]
+        )
+        for domain, stats in domain_stats.items()
+        if stats["total"] > 0
+    ])
+
+
+def save_attempt(mode, score, total, domain_stats, responses=(), reviews=()):
+    # reviews: save_reviews() rows from the same session
+    conn = get_connection()
 
     percentage = (score / total) * 100
 
-    cursor.execute("""
-        INSERT INTO attempts (date, mode, score, total, percentage, domain_stats)
-        VALUES (?, ?, ?, ?, ?, ?)
-    """, (
-        datetime.now().strftime("%Y-%m-%d %H:%M"),
-        mode,
-        score,
-        total,
-        percentage,
-        json.dumps(domain_stats)
-    ))
+    with conn:
+        cursor = conn.execute(SQL_INSERT_ATTEMPT, (
+            datetime.now().strftime("%Y-%m-%d %H:%M"),
+            mode,
+            score,
+            total,
+            percentage
+        ))
+        attempt_id = cursor.lastrowid
+
+        conn.executemany(SQL_INSERT_ATTEMPT_DOMAIN, [
+            (attempt_id, domain, stats["correct"], stats["total"])
+            for domain, stats in domain_stats.items()
+        ])
+
+        conn.executemany(SQL_INSERT_RESPONSE, [
+            (attempt_id, *response) for response in responses
+        ])
+
+        conn.executemany(SQL_UPSERT_REVIEW, reviews)
+
+        update_summary(conn, mode, percentage, total, domain_stats)
+
+    return attempt_id
+
+
+def save_reviews(rows):
+    # rows: (user_id, question_id, repetitions, interval_days, ease, due)
+    conn = get_connection()
+
+    with conn:
+        conn.executemany(SQL_UPSERT_REVIEW, rows)
+
+
+def get_due_reviews(now, limit, user_id=LOCAL_USER, include_pro=True):
+    # Free pages share the local user's schedule with Pro ones, so Pro
+    # questions scheduled there are skipped unless include_pro
+    conn = get_connection()
+
+    return [
+        question_id
+        for (question_id,) in conn.execute(
+            SQL_SELECT_DUE_REVIEWS, (user_id, now, int(include_pro), limit)
+        )
+    ]
+
+
+def get_review_states(user_id=LOCAL_USER):
+    conn = get_connection()
+
+    return {
+        row[0]: row[1:]
+        for row in conn.execute(SQL_SELECT_REVIEW_STATES, (user_id,))
+    }
+
+
+def merge_progress(user_id, answered, right):
+    # One session's bits (ints over question ids) applied to the stored
+    # bitsets under the write lock, so sessions saved by different workers
+    # add up instead of overwriting each other. Returns the merged
+    # (seen, correct).
+    conn = get_connection()
+
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+
+        seen, correct = (int.from_bytes(blob, "little") for blob in get_progress(user_id))
+        seen |= answered
+        correct = (correct & ~answered) | right
+
+        conn.execute(SQL_UPSERT_PROGRESS, (
+            user_id,
+            seen.to_bytes((seen.bit_length() + 7) // 8, "little"),
+            correct.to_bytes((correct.bit_length() + 7) // 8, "little")
+        ))
+
+    return seen, correct
+
+
+def get_progress(user_id=LOCAL_USER):
+    conn = get_connection()
+
+    row = conn.execute(SQL_SELECT_PROGRESS, (user_id,)).fetchone()
+
+    return row if row is not None else (b"", b"")
+
+
+def get_attempts_page(before_id=None, limit=ATTEMPTS_PAGE_SIZE):
+    conn = get_connection()
+
+    if before_id is None:
+        before_id = 2 ** 63 - 1
+
+    return [
+        {
+            "id": row[0],
+            "date": row[1],
+            "mode": row[2],
+            "score": row[3],
+            "total": row[4],
+            "percentage": row[5]
+        }
+        for row in conn.execute(SQL_SELECT_ATTEMPTS_PAGE, (before_id, limit))
+    ]
+
+
+def get_latest_domain_stats():
+    conn = get_connection()
+
+    return {
+        domain: {"correct": correct, "total": total}
+        for domain, correct, total in conn.execute(SQL_LATEST_DOMAIN_STATS)
+    }
+
+
+def get_question_stats():
+    conn = get_connection()
+
+    return {
+        question_id: (answered, correct)
+        for question_id, answered, correct in conn.execute(SQL_QUESTION_STATS)
+    }
 
-    conn.commit()
-    conn.close()
 
+def get_attempts_version():
+    # Bumped by every saved attempt, from any process
+    return get_connection().execute(SQL_ATTEMPTS_VERSION).fetchone()[0]
 
-def get_attempts():
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
 
-    cursor.execute("SELECT date, mode, score, total, percentage, domain_stats FROM attempts")
-    rows = cursor.fetchall()
+def get_analytics_summary(mode):
+    conn = get_connection()
 
-    conn.close()
+    row = conn.execute(SQL_SELECT_SUMMARY, (mode,)).fetchone()
 
-    attempts = []
-    for row in rows:
-        attempts.append({
-            "date": row[0],
-            "mode": row[1],
-            "score": row[2],
-            "total": row[3],
-            "percentage": row[4],
-            "domain_stats": json.loads(row[5]) if row[5] else {}
-        })
+    if row is None:
+        return None
 
-    return attempts
+    attempts, sum_percentage, max_percentage, total_questions = row
 
+    return {
+        "attempts": attempts,
+        "lifetime_avg": sum_percentage / attempts,
+        "best_score": max_percentage,
+        "total_questions": total_questions,
+        "recent": [p for (p,) in conn.execute(SQL_SELECT_RECENT, (mode,))],
+        "domain_averages": dict(conn.execute(SQL_SELECT_DOMAIN_SUMMARY, (mode,)).fetchall())
+    }
@@ -0,0 +1,181 @@
+import argparse
+import json
+import os
+import re
+import sys
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from question_bank import QUESTIONS_FILE
+
+# ---------------- MINHASH / LSH ----------------
+# Each question (text plus options) becomes a set of character 5-gram
+# shingles and a 128-value MinHash signature. Signatures are cut into 32
+# bands of 4 rows; questions sharing any band are candidates (roughly
+# linear in the bank size), and only candidates get an exact Jaccard check.
+SHINGLE_SIZE = 5   # characters; word n-grams are too coarse for short questions
+NUM_PERM = 128
+BANDS = 32
+ROWS = NUM_PERM // BANDS
+
+SIMILARITY_THRESHOLD = 0.7
+
+# Signatures are computed in a process pool above this many questions
+PARALLEL_MIN = 2000
+CHUNK_SIZE = 500
+
+_PRIME = (1 << 31) - 1
+_rng = np.random.default_rng(20260)   # fixed, so every worker agrees
+_A = _rng.integers(1, 1 << 29, NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, 1 << 29, NUM_PERM, dtype=np.uint64)
+
+
+def question_text(question):
+    return " ".join([question["question"], *question.get("options", [])])
+
+
+def shingles(text):
+    text = " ".join(re.findall(r"\w+", text.lower()))
+
+    if len(text) <= SHINGLE_SIZE:
+        return {text} if text else set()
+
+    return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def signature(shingle_set):
+    if not shingle_set:
+        return np.full(NUM_PERM, _PRIME, dtype=np.uint64)
+
+    # crc32 rather than hash(): stable across processes and runs
+    x = np.fromiter((zlib.crc32(s.encode()) for s in shingle_set), dtype=np.uint64)
+
+    return ((_A[:, None] * x[None, :] + _B[:, None]) % _PRIME).min(axis=1)
+
+
+def _signatures(texts):
+    if not texts:
+        return np.empty((0, NUM_PERM), dtype=np.uint64)
+    return np.stack([signature(shingles(t)) for t in texts])
+
+
+def signatures(texts, workers=None):
+    if len(texts) < PARALLEL_MIN or workers == 1:
+        return _signatures(texts)
+
+    chunks = [texts[i:i + CHUNK_SIZE] for i in range(0, len(texts), CHUNK_SIZE)]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return np.concatenate(list(pool.map(_signatures, chunks)))
+
+
+def candidate_pairs(sigs):
+    pairs = set()
+
+    for band in range(BANDS):
+        buckets = {}
+        rows = sigs[:, band * ROWS:(band + 1) * ROWS]
+
+        for i, key in enumerate(map(bytes, rows)):
+            buckets.setdefault(key, []).append(i)
+
+        for members in buckets.values():
+            if len(members) > 1:
+                for a in range(len(members)):
+                    for b in range(a + 1, len(members)):
+                        pairs.add((members[a], members[b]))
+
+    return pairs
+
+
+def jaccard(a, b):
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def find_duplicates(questions, threshold=SIMILARITY_THRESHOLD, workers=None):
+    # Returns (clusters, pairs): clusters are sorted lists of question
+    # indexes, pairs are (i, j, similarity) with similarity >= threshold
+    texts = [question_text(q) for q in questions]
+    sigs = signatures(texts, workers)
+
+    candidates = np.array(sorted(candidate_pairs(sigs)), dtype=np.int64).reshape(-1, 2)
+
+    # Signature estimate for every candidate at once; exact Jaccard only for
+    # the ones that come close
+    estimates = (sigs[candidates[:, 0]] == sigs[candidates[:, 1]]).mean(axis=1)
+    candidates = candidates[estimates >= threshold - 0.15]
+
+    shingle_sets = {}
+    pairs = []
+
+    for i, j in candidates.tolist():
+        for k in (i, j):
+            if k not in shingle_sets:
+                shingle_sets[k] = shingles(texts[k])
+
+        similarity = jaccard(shingle_sets[i], shingle_sets[j])
+        if similarity >= threshold:
+            pairs.append((i, j, similarity))
+
+    # Union-find over the duplicate pairs
+    parent = {}
+
+    def find(x):
+        parent.setdefault(x, x)
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for i, j, _ in pairs:
+        parent[find(i)] = find(j)
+
+    clusters = {}
+    for x in parent:
+        clusters.setdefault(find(x), []).append(x)
+
+    return sorted((sorted(c) for c in clusters.values()), key=lambda c: c[0]), pairs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report near-duplicate questions in a bank file")
+    parser.add_argument("path", nargs="?", default=QUESTIONS_FILE)
+    parser.add_argument("--threshold", type=float, default=SIMILARITY_THRESHOLD)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--json", action="store_true", help="print clusters as JSON")
+    parser.add_argument("--check", action="store_true", help="exit with status 1 if any are found")
+    args = parser.parse_args()
+
+    with open(args.path, "r", encoding="utf-8") as f:
+        questions = json.load(f)
+
+    clusters, pairs = find_duplicates(questions, args.threshold, args.workers)
+
+    similarity = {}
+    for i, j, s in pairs:
+        similarity[i] = max(similarity.get(i, 0.0), s)
+        similarity[j] = max(similarity.get(j, 0.0), s)
+
+    if args.json:
+        print(json.dumps([
+            [{"id": i, "similarity": round(similarity[i], 3), "question": questions[i]["question"]} for i in c]
+            for c in clusters
+        ], indent=2))
+    else:
+        for c in clusters:
+            print(f"cluster of {len(c)}:")
+            for i in c:
+                print(f"  #{i:<6} {similarity[i]:.2f}  {questions[i]['question'][:90]}")
+        print(f"{len(questions)} questions, {len(clusters)} near-duplicate clusters "
+              f"({sum(len(c) for c in clusters)} questions) at similarity >= {args.threshold}")
+
+    if args.check and clusters:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import asyncio
+import contextvars
+import heapq
+import inspect
+import logging
+import math
+import time
+
+log = logging.getLogger(__name__)
+
+# ---------------- EXAM CLOCK ----------------
+# One task per process counts down every timed session. Time left is always
+# deadline - time.monotonic(), so slow ticks never add up to drift. The task
+# wakes on whole seconds to refresh the displays and exactly at the earliest
+# deadline to expire it, and exits once no timers are left.
+TICK = 1.0
+
+
+class ExamClock:
+    def __init__(self, tick=TICK):
+        self.tick = tick
+        self.timers = {}        # key -> (deadline, on_tick, on_expire)
+
+        self._deadlines = []    # heap of (deadline, key); stale entries skipped
+        self._task = None
+        self._wake = None
+        self._wake_at = math.inf
+
+    def __len__(self):
+        return len(self.timers)
+
+    def add(self, key, deadline, on_tick, on_expire):
+        # on_tick(remaining_seconds) about once per tick; on_expire() once at
+        # the deadline, and may be a coroutine function
+        self.timers[key] = (deadline, on_tick, on_expire)
+        heapq.heappush(self._deadlines, (deadline, key))
+
+        self._call(on_tick, max(0.0, deadline - time.monotonic()))
+
+        if self._task is None or self._task.done():
+            self._wake = asyncio.Event()
+            # Own context, so no session's page context leaks into the others
+            self._task = asyncio.get_running_loop().create_task(
+                self._run(), context=contextvars.Context()
+            )
+        elif deadline < self._wake_at:
+            # Due before the task would next wake up
+            self._wake.set()
+
+    def remove(self, key):
+        self.timers.pop(key, None)
+
+    async def _run(self):
+        # add() already showed the starting time
+        next_tick = (math.floor(time.monotonic() / self.tick) + 1) * self.tick
+
+        while self.timers:
+            now = time.monotonic()
+
+            while self._deadlines and self._deadlines[0][0] <= now:
+                deadline, key = heapq.heappop(self._deadlines)
+                timer = self.timers.get(key)
+
+                if timer is not None and timer[0] == deadline:
+                    del self.timers[key]
+                    self._call(timer[2])
+
+            if now >= next_tick:
+                for deadline, on_tick, _ in list(self.timers.values()):
+                    self._call(on_tick, max(0.0, deadline - now))
+                next_tick = (math.floor(now / self.tick) + 1) * self.tick
+
+            self._wake_at = next_tick
+            if self._deadlines:
+                self._wake_at = min(next_tick, self._deadlines[0][0])
+
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), max(0.0, self._wake_at - time.monotonic()))
+            except asyncio.TimeoutError:
+                pass
+
+        self._wake_at = math.inf
+
+    def _call(self, fn, *args):
+        # One session's failing callback must not stop everyone's clock
+        try:
+            result = fn(*args)
+            if inspect.isawaitable(result):
+                asyncio.ensure_future(result)
+        except Exception:
+            log.exception("exam clock callback failed")
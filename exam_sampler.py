@@ -0,0 +1,85 @@
+import numpy as np
+
+MOCK_EXAM_SIZE = 180
+
+# PMP Exam Content Outline domain weights
+ECO_BLUEPRINT = {
+    "People": 0.42,
+    "Process": 0.50,
+    "Business Environment": 0.08,
+}
+
+# Extra blueprint weight given to the user's weakest domain (~9 questions)
+WEAKEST_BOOST = 0.05
+
+
+class StratifiedSampler:
+    # Flattens the per-category pools into one id array once, so a whole form
+    # is drawn with a single lexsort instead of one random.sample per pool.
+    def __init__(self, pools):
+        self.categories = tuple(pools)
+        self.capacity = np.array([len(pools[c]) for c in self.categories], dtype=np.int64)
+
+        if self.categories:
+            self.ids = np.concatenate([
+                np.asarray(pools[c], dtype=np.int64) for c in self.categories
+            ])
+        else:
+            self.ids = np.empty(0, dtype=np.int64)
+
+        self.codes = np.repeat(np.arange(len(self.categories)), self.capacity)
+        self.offsets = np.concatenate(([0], np.cumsum(self.capacity)[:-1])).astype(np.int64)
+
+    def quotas(self, size, blueprint, boosts=None):
+        weights = np.array(
+            [blueprint.get(c, 0.0) + (boosts or {}).get(c, 0.0) for c in self.categories],
+            dtype=float
+        )
+
+        quota = np.zeros(len(self.categories), dtype=np.int64)
+        remaining = min(size, int(self.capacity.sum()))
+
+        # Largest-remainder apportionment, capped at each pool's size. Whatever
+        # a short pool cannot supply is redistributed over the pools that still
+        # have room; once the blueprint pools are exhausted the rest is spread
+        # by availability over every other pool.
+        while remaining > 0:
+            free = self.capacity - quota
+            w = np.where(free > 0, weights, 0.0)
+
+            if w.sum() <= 0:
+                w = free.astype(float)
+
+            share = w / w.sum() * remaining
+            add = np.floor(share).astype(np.int64)
+
+            leftover = remaining - int(add.sum())
+            if leftover:
+                order = np.argsort(-(share - add), kind="stable")
+                add[order[:leftover]] += 1
+
+            add = np.minimum(add, free)
+            quota += add
+            remaining -= int(add.sum())
+
+        return quota
+
+    def sample(self, quota, rng):
+        # Random key per id, sort by (category, key), keep each category's
+        # first quota[c] entries.
+        keys = rng.random(len(self.ids))
+        order = np.lexsort((keys, self.codes))
+
+        codes = self.codes[order]
+        ranks = np.arange(len(order)) - self.offsets[codes]
+
+        form = self.ids[order[ranks < quota[codes]]]
+        rng.shuffle(form)
+
+        return form
+
+    def assemble(self, size=MOCK_EXAM_SIZE, blueprint=ECO_BLUEPRINT, boosts=None, seed=None):
+        rng = np.random.default_rng(seed)
+        quota = self.quotas(size, blueprint, boosts)
+
+        return self.sample(quota, rng).tolist()
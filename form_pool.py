@@ -0,0 +1,88 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from exam_sampler import ECO_BLUEPRINT, MOCK_EXAM_SIZE, WEAKEST_BOOST
+
+# Ready forms kept per weakness profile
+FORMS_PER_PROFILE = 3
+
+
+def weakest_domain(domain_stats):
+    performance = {}
+
+    for domain, stats in domain_stats.items():
+        if stats["total"] > 0:
+            performance[domain] = stats["correct"] / stats["total"]
+
+    if not performance:
+        return None
+
+    return min(performance, key=performance.get)
+
+
+class FormPool:
+    # Mock exam forms assembled ahead of time by a background worker, keyed by
+    # weakness profile (the boosted domain, or None). Serving a form is a dict
+    # lookup and a list pop; the worker refills the slot afterwards. Forms
+    # are question id lists, so ready forms cost little memory.
+    def __init__(self, sampler, depth=FORMS_PER_PROFILE, size=MOCK_EXAM_SIZE,
+                 blueprint=ECO_BLUEPRINT):
+        self.sampler = sampler
+        self.depth = depth
+        self.size = size
+        self.blueprint = blueprint
+        self.profile = None
+        self.forms = {}
+
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mock-forms")
+
+    def normalize(self, domain):
+        # Domains with no Pro pool cannot be boosted, so they share the
+        # default profile
+        return domain if domain in self.sampler.categories else None
+
+    def set_profile(self, domain):
+        self.profile = self.normalize(domain)
+        self.refill(self.profile)
+
+    def warm(self):
+        for profile in (None, *self.sampler.categories):
+            self.refill(profile)
+
+    def generate(self, profile=None):
+        boosts = {profile: WEAKEST_BOOST} if profile else None
+        return self.sampler.assemble(self.size, self.blueprint, boosts)
+
+    def take(self, profile=None):
+        if profile is None:
+            profile = self.profile
+
+        try:
+            form = self.forms[profile].pop()
+        except (KeyError, IndexError):
+            form = None
+
+        self.refill(profile)
+        return form
+
+    def refill(self, profile):
+        with self._lock:
+            if profile in self._pending:
+                return
+            self._pending.add(profile)
+
+        self._executor.submit(self._fill, profile)
+
+    def _fill(self, profile):
+        try:
+            forms = self.forms.setdefault(profile, [])
+            while len(forms) < self.depth:
+                forms.append(self.generate(profile))
+        finally:
+            with self._lock:
+                self._pending.discard(profile)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,156 @@
+import mmap
+import os
+import re
+import tempfile
+import threading
+from array import array
+from collections import OrderedDict
+
+import bank_compiler
+from question_bank import get_compact_meta, get_content_hash, get_questions
+
+# ---------------- LAZY QUESTION BANK ----------------
+# Only compact metadata stays resident: category, difficulty, tier and
+# answer index, a few bytes per question. Question, option and explanation
+# text lives in one compiled shard per category (bank_compiler format) that
+# is memory-mapped the first time one of its questions is asked for, and is
+# decoded per question with the most recently used HOT_ITEMS kept.
+SHARD_DIR = "bank_shards"
+HOT_ITEMS = 256
+
+MISSING = 0xFF   # category code of ids not in the bank
+PRO = 0x80       # flag bit; the low bits are the answer index
+
+
+def shard_path(directory, category):
+    return os.path.join(directory, re.sub(r"\W+", "-", category.lower()) + ".bank")
+
+
+def write_shards(directory, questions, content_hash):
+    # questions in id order; each shard keeps that order
+    by_category = {}
+    for q in questions:
+        by_category.setdefault(q["category"], []).append(q)
+
+    os.makedirs(directory, exist_ok=True)
+    source_hash = bytes.fromhex(content_hash)
+
+    for category, group in by_category.items():
+        path = shard_path(directory, category)
+
+        # Unique temp name: every worker may rewrite the shards at startup
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(bank_compiler.compile_bank(group, source_hash))
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+
+def _shard_current(path, content_hash):
+    try:
+        return bank_compiler.read_source_hash(path) == content_hash
+    except (OSError, ValueError):
+        return False
+
+
+class LazyBank:
+    # id -> question dict lookup over the shards; QuizEngine accepts it in
+    # place of its own question table
+    def __init__(self, meta_rows, directory=SHARD_DIR):
+        size = meta_rows[-1][0] + 1 if meta_rows else 0
+
+        self.directory = directory
+        self.category = array("B", [MISSING]) * size
+        self.difficulty = array("B", bytes(size))
+        self.flags = bytearray(size)
+        self.local = array("I", bytes(4 * size))   # position within the shard
+
+        category_codes = {}
+        difficulty_codes = {}
+        shard_sizes = []
+
+        for question_id, category, difficulty, is_pro, answer in meta_rows:
+            code = category_codes.setdefault(category, len(category_codes))
+            if code == len(shard_sizes):
+                shard_sizes.append(0)
+
+            self.category[question_id] = code
+            self.difficulty[question_id] = difficulty_codes.setdefault(difficulty, len(difficulty_codes))
+            self.flags[question_id] = answer | (PRO if is_pro else 0)
+            self.local[question_id] = shard_sizes[code]
+            shard_sizes[code] += 1
+
+        self.categories = list(category_codes)
+        self.difficulties = list(difficulty_codes)
+
+        self._shards = {}
+        self._hot = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.category) - self.category.count(MISSING)
+
+    def __contains__(self, question_id):
+        return 0 <= question_id < len(self.category) and self.category[question_id] != MISSING
+
+    def category_of(self, question_id):
+        return self.categories[self.category[question_id]]
+
+    def difficulty_of(self, question_id):
+        return self.difficulties[self.difficulty[question_id]]
+
+    def correct_answer(self, question_id):
+        return self.flags[question_id] & ~PRO
+
+    def is_pro(self, question_id):
+        return bool(self.flags[question_id] & PRO)
+
+    def shard(self, code):
+        shard = self._shards.get(code)
+
+        if shard is None:
+            with open(shard_path(self.directory, self.categories[code]), "rb") as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            shard = self._shards[code] = bank_compiler.CompiledBank(data)
+
+        return shard
+
+    def question(self, question_id):
+        if question_id not in self:
+            raise KeyError(question_id)
+
+        with self._lock:
+            question = self._hot.get(question_id)
+
+            if question is not None:
+                self._hot.move_to_end(question_id)
+                return question
+
+            question = self.shard(self.category[question_id]).question(self.local[question_id])
+            question["id"] = question_id
+
+            self._hot[question_id] = question
+            if len(self._hot) > HOT_ITEMS:
+                self._hot.popitem(last=False)
+
+        return question
+
+    __getitem__ = question
+
+    def get_many(self, ids):
+        return [self.question(i) for i in ids]
+
+
+def open_bank(directory=SHARD_DIR):
+    # Shards are rewritten from the questions table when any is missing or
+    # from another import, so they always match the bank build_bank() made
+    content_hash = get_content_hash()
+    meta = get_compact_meta()
+
+    if not all(_shard_current(shard_path(directory, c), content_hash) for c in {row[1] for row in meta}):
+        write_shards(directory, get_questions(), content_hash)
+
+    return LazyBank(meta, directory)
@@ -1,20 +1,103 @@
 import os
+import math
+import logging
 import flet as ft
-import json
 import random
 import asyncio
-from database import init_db, save_attempt, get_attempts
+from database import (
+    init_db, get_latest_domain_stats, get_question_stats, ATTEMPTS_PAGE_SIZE
+)
+from question_bank import build_bank, get_index, TIER_FREE, TIER_PRO, HIGHLIGHT
+from exam_sampler import StratifiedSampler
+from adaptive import ItemPool
+from review import ReviewScheduler, REVIEW_SIZE
+from progress import QuestionProgress
+from form_pool import FormPool, weakest_domain
+from lazy_bank import open_bank
+from bank_compiler import OPTION_COUNT
+import async_db as db
+import session_journal
+from quiz_engine import QuizEngine
+from session_journal import SessionJournal
+from update_scheduler import UpdateScheduler
+from exam_clock import ExamClock
+from startup import Startup
+from analytics import VIEWS, analytics_view, attempts_page
 
-init_db()
+# ---------------- STARTUP ----------------
+# Set once per process by the STARTUP phases below, which run in the
+# background; every page waits for them behind the splash (see load_app)
+QUESTION_INDEX = None
+BANK = None
+ENGINE = None
+MOCK_SAMPLER = None
+MOCK_FORMS = None
+ADAPTIVE_ITEMS = None
+REVIEWS = None
+PROGRESS = None
 
 
-def load_questions():
-    with open("questions.json", "r", encoding="utf-8") as f:
-        return json.load(f)
+def open_database():
+    init_db()
 
 
+def load_question_bank():
+    global QUESTION_INDEX, BANK, ENGINE
 
-QUESTIONS = load_questions()
+    build_bank()
+    QUESTION_INDEX = get_index()
+
+    # Question text is read from per-category shards only when shown
+    BANK = open_bank()
+    ENGINE = QuizEngine(BANK)
+
+
+def prepare_exams():
+    global MOCK_SAMPLER, MOCK_FORMS, ADAPTIVE_ITEMS
+
+    MOCK_SAMPLER = StratifiedSampler(QUESTION_INDEX.categories(TIER_PRO))
+
+    MOCK_FORMS = FormPool(MOCK_SAMPLER)
+    MOCK_FORMS.set_profile(weakest_domain(get_latest_domain_stats()))
+    MOCK_FORMS.warm()
+
+    # Whole bank, difficulties calibrated from the answer history at startup
+    ADAPTIVE_ITEMS = ItemPool.from_index(QUESTION_INDEX, stats=get_question_stats())
+
+
+def load_user_state():
+    global REVIEWS, PROGRESS
+
+    # Spaced-repetition state of the local user
+    REVIEWS = ReviewScheduler.load()
+
+    # Seen / correct question bitsets of the local user
+    PROGRESS = QuestionProgress.load()
+
+
+def warm_analytics():
+    # First Results / Analytics visit on any page is served from the cache
+    for mode in VIEWS:
+        analytics_view(mode)
+    attempts_page()
+
+
+STARTUP = Startup([
+    ("database", open_database),
+    ("question bank", load_question_bank),
+    ("exam pools", prepare_exams),
+    ("user state", load_user_state),
+    ("analytics", warm_analytics),
+]).start()
+
+MOCK_TIME_LIMIT = 10800   # 180 minutes real PMP
+
+# Counts down every timed session in the process
+EXAM_CLOCK = ExamClock()
+
+# Handlers send their changes through the page's UpdateScheduler rather than
+# Flet's automatic page update after every event
+ft.context.disable_auto_update()
 
 
 def main(page: ft.Page):
@@ -32,17 +115,13 @@ def main(page: ft.Page):
     page.bgcolor = BRAND_LIGHT_BG
     page.dialog = None
 
+    updates = UpdateScheduler(page)
+
 
     # ---------------- STATE ----------------
-    current_question_index = 0
-    score = 0
-    quiz_questions = []
-    total_questions = 0
-    timer_seconds = 0
-    timer_running = False
-    mode = "Practice"
-    domain_correct = {}
-    domain_total = {}
+    session = None        # active QuizSession, owned by ENGINE
+    journal = None        # SessionJournal of the active timed session
+    review_rows = []      # SM-2 rows of the active session, written when it ends
     is_pro_user = False   # <-- ADD THIS
 
     # ---------------- SPACING ----------------
@@ -55,18 +134,48 @@ def main(page: ft.Page):
     # ---------------- FADE SWITCH ----------------
     def switch_content(new_content):
         content_area.opacity = 0
-        page.update()
+        updates.request()
 
         async def fade():
             await asyncio.sleep(0.1)
             content_area.content = new_content
             content_area.opacity = 1
-            page.update()
+            updates.request()
 
         page.run_task(fade)
 
+    # ---------------- THEMED SCREENS ----------------
+    # Results and Analytics screens built on this page, kept for as long as
+    # the cached view they show (see analytics.py). Each lists its
+    # theme-dependent (control, attribute, light, dark) values, so a theme
+    # change recolors it in place instead of re-reading and rebuilding it.
+    screens = {}   # name -> {"source", "layout", "styles"}
+
+    def theme_style(styles, control, attribute, light, dark):
+        styles.append((control, attribute, light, dark))
+        setattr(control, attribute, dark if page.theme_mode == ft.ThemeMode.DARK else light)
+        return control
+
+    def restyle(styles):
+        is_dark = page.theme_mode == ft.ThemeMode.DARK
+
+        for control, attribute, light, dark in styles:
+            setattr(control, attribute, dark if is_dark else light)
+
+    def cached_screen(name, source, build):
+        # Rebuilt only once the view behind it was replaced
+        screen = screens.get(name)
+
+        if screen is None or screen["source"] is not source:
+            styles = []
+            screen = screens[name] = {
+                "source": source, "layout": build(source, styles), "styles": styles
+            }
+
+        return screen["layout"]
+
     # ---------------- DARK MODE ----------------
-    def toggle_theme(e):
+    async def toggle_theme(e):
         if page.theme_mode == ft.ThemeMode.LIGHT:
             page.theme_mode = ft.ThemeMode.DARK
             page.bgcolor = BRAND_DARK_BG
@@ -74,12 +183,14 @@ def main(page: ft.Page):
             page.theme_mode = ft.ThemeMode.LIGHT
             page.bgcolor = BRAND_LIGHT_BG
 
-        page.update()
+        for screen in screens.values():
+            restyle(screen["styles"])
+
+        explanation_container.bgcolor = (
+            BRAND_CARD_BG if page.theme_mode == ft.ThemeMode.LIGHT else BRAND_DARK_CARD
+        )
 
-        if navigation.selected_index == 1:
-            show_results()
-        elif navigation.selected_index == 2:
-            show_analytics()
+        updates.request()
 
     theme_switch = ft.Switch(label="Dark Mode", on_change=toggle_theme)
 
@@ -121,132 +232,162 @@ def main(page: ft.Page):
     progress_text = ft.Text(weight="bold")
     timer_display = ft.Text(color="red")
     question_text = ft.Text(size=18)
-    options_column = ft.Column(spacing=SPACE_SM)
+
+    # Fixed set of controls, mutated in place for every question; only the
+    # changed properties go over the wire
+    option_radios = [ft.Radio(value=str(i)) for i in range(OPTION_COUNT)]
+    options_column = ft.Column(option_radios, spacing=SPACE_SM)
     radio_group = ft.RadioGroup(content=options_column)
-    explanation_container = ft.Container(visible=False)
+
+    result_label = ft.Text(weight="bold")
+    correct_answer_text = ft.Text(weight="bold")
+    explanation_text = ft.Text()
+    explanation_container = ft.Container(
+        content=ft.Column([result_label, correct_answer_text, explanation_text], spacing=6),
+        padding=SPACE_SM,
+        border_radius=10,
+        visible=False
+    )
     continue_button = ft.ElevatedButton("Continue", visible=False)
 
-    async def update_timer():
-        nonlocal timer_seconds, timer_running
-        while timer_seconds > 0 and timer_running:
-            mins = timer_seconds // 60
-            secs = timer_seconds % 60
-            timer_display.value = f"Time Left: {mins:02}:{secs:02}"
-            page.update()
-            await asyncio.sleep(1)
-            timer_seconds -= 1
-        if timer_running:
-            submit_exam(None)
-
-    def start_timer(seconds):
-        nonlocal timer_seconds, timer_running
-        timer_seconds = seconds
-        timer_running = True
-        page.run_task(update_timer)
+    def show_time_left(remaining):
+        mins, secs = divmod(math.ceil(remaining), 60)
+        timer_display.value = f"Time Left: {mins:02}:{secs:02}"
+
+        # Only the timer text, and only while the exam is on screen
+        if content_area.content is quiz_view:
+            updates.request(timer_display)
+
+    async def time_up(session_id):
+        if session is not None and session.id == session_id:
+            await submit_exam(None)
+
+    def start_timer():
+        # Deadline-based, so a resumed exam picks up where its clock stopped
+        session_id = session.id
+        EXAM_CLOCK.add(
+            session_id, session.deadline, show_time_left,
+            lambda: page.run_task(time_up, session_id)
+        )
 
     def show_question():
-        question = quiz_questions[current_question_index]
-        progress_text.value = f"{mode} | Question {current_question_index+1}/{total_questions}"
+        question = ENGINE.current_question(session)
+        if session.adaptive is not None:
+            progress_text.value = (
+                f"{session.mode} | Question {session.index+1} "
+                f"(up to {session.adaptive.max_items})"
+            )
+        else:
+            progress_text.value = f"{session.mode} | Question {session.index+1}/{session.total}"
         question_text.value = question["question"]
         radio_group.value = None
-        options_column.controls.clear()
+        explanation_container.visible = False
+        continue_button.visible = False
 
-        for i, option in enumerate(question["options"]):
-            options_column.controls.append(
-                ft.Radio(value=str(i), label=option)
-            )
+        for radio, option in zip(option_radios, question["options"]):
+            radio.label = option
 
-        page.update()
+        push_quiz()
+
+    def push_quiz():
+        # One diff of the quiz view instead of the whole page. Until the view
+        # is shown (first question of a session) switch_content sends it.
+        if content_area.content is quiz_view:
+            updates.request(quiz_view)
 
     def next_question(e):
-        nonlocal score, current_question_index
+        if session is None or radio_group.value is None:
+            return
 
-        if radio_group.value is None:
+        current_question = ENGINE.current_question(session)
+        is_correct = ENGINE.answer(session, int(radio_group.value))
+
+        if is_correct is None:
             return
 
-        selected_index = int(radio_group.value)
-        current_question = quiz_questions[current_question_index]
-        correct_index = current_question["correct_answer"]
-        category = current_question["category"]
+        if journal is not None:
+            journal.record(session)
 
-        # Track totals
-        domain_total[category] = domain_total.get(category, 0) + 1
+        # SM-2 update runs inline; the rows are written with the attempt
+        review_rows.append(
+            REVIEWS.record(current_question["id"], is_correct, session.times[session.index])
+        )
+
+        correct_index = current_question["correct_answer"]
 
-        if selected_index == correct_index:
-            score += 1
-            domain_correct[category] = domain_correct.get(category, 0) + 1
-            result_text = "✅ Correct!"
-            result_color = ft.Colors.GREEN
+        if is_correct:
+            result_label.value = "✅ Correct!"
+            result_label.color = ft.Colors.GREEN
         else:
-            result_text = "❌ Incorrect!"
-            result_color = ft.Colors.RED
+            result_label.value = "❌ Incorrect!"
+            result_label.color = ft.Colors.RED
 
-        correct_option_text = current_question["options"][correct_index]
-        explanation_text = current_question.get("explanation", "No explanation provided.")
+        correct_answer_text.value = f"Correct Answer: {current_question['options'][correct_index]}"
+        explanation_text.value = current_question.get("explanation") or "No explanation provided."
 
-        explanation_container.content = ft.Container(
-            content=ft.Column(
-                [
-                    ft.Text(result_text, weight="bold", color=result_color),
-                    ft.Text(f"Correct Answer: {correct_option_text}", weight="bold"),
-                    ft.Text(explanation_text),
-                ],
-                spacing=6
-            ),
-            padding=SPACE_SM,
-            bgcolor=BRAND_CARD_BG if page.theme_mode == ft.ThemeMode.LIGHT else BRAND_DARK_CARD,
-            border_radius=10
+        explanation_container.bgcolor = (
+            BRAND_CARD_BG if page.theme_mode == ft.ThemeMode.LIGHT else BRAND_DARK_CARD
         )
-
         explanation_container.visible = True
 
         continue_button.visible = True
         continue_button.on_click = continue_to_next
 
-        page.update()
-
-    def continue_to_next(e):
-        nonlocal current_question_index
+        push_quiz()
 
-        explanation_container.visible = False
-        continue_button.visible = False
-        radio_group.value = None
-
-        current_question_index += 1
+    async def continue_to_next(e):
+        if session is None:
+            return
 
-        if current_question_index < total_questions:
+        if ENGINE.advance(session) is not None:
             show_question()
         else:
-            submit_exam(None)
-
-        page.update()
+            await submit_exam(None)
 
 
-    def submit_exam(e):
-        nonlocal timer_running
-        timer_running = False
+    async def submit_exam(e):
+        nonlocal session, journal
 
-        percentage = (score / total_questions) * 100 if total_questions else 0
+        if session is None:
+            return
 
-        # ---------------- FIXED DOMAIN STRUCTURE ----------------
-        domain_stats = {}
+        EXAM_CLOCK.remove(session.id)
+        result = ENGINE.finish(session)
+        session = None
+
+        reviews = review_rows[:]
+        review_rows.clear()
+
+        # One transaction for the attempt, every buffered response and the
+        # session's review updates, handed to the writer thread so the event
+        # loop keeps running
+        await db.save_attempt(
+            result["mode"],
+            result["score"],
+            result["total"],
+            result["domain_stats"],
+            result["responses"],
+            reviews
+        )
 
-        for domain in domain_total:
-            correct = domain_correct.get(domain, 0)
-            total = domain_total.get(domain, 0)
+        # Merged into the stored bitsets, then read back with whatever other
+        # workers saved meanwhile
+        answered, right = PROGRESS.update(result["responses"])
+        PROGRESS.refresh(*await db.merge_progress(PROGRESS.user_id, answered, right))
 
-            domain_stats[domain] = {
-                "correct": correct,
-                "total": total
-            }
+        # Saved for good, so there is nothing left to resume
+        if journal is not None:
+            journal.discard()
+            journal = None
 
-        save_attempt(mode, score, total_questions, domain_stats)
+        # The next mock boosts whatever this attempt showed as weakest
+        MOCK_FORMS.set_profile(weakest_domain(result["domain_stats"]))
 
         result_layout = ft.Column(
             [
-                ft.Text(f"{mode} Result", size=22, weight="bold"),
-                ft.Text(f"Score: {score}/{total_questions}", size=18, weight="bold"),
-                ft.Text(f"{percentage:.2f}%"),
+                ft.Text(f"{result['mode']} Result", size=22, weight="bold"),
+                ft.Text(f"Score: {result['score']}/{result['total']}", size=18, weight="bold"),
+                ft.Text(f"{result['percentage']:.2f}%"),
                 ft.Container(height=SPACE_MD),
                 primary_button("Back to Home", lambda e: show_home())
             ],
@@ -254,160 +395,205 @@ def main(page: ft.Page):
             spacing=SPACE_SM
         )
 
+        if "readiness" in result:
+            result_layout.controls.insert(3, ft.Text(
+                f"Estimated readiness: {result['readiness']:.0f}% "
+                f"(ability {result['ability']:+.2f} ± {result['se']:.2f})"
+            ))
+
         switch_content(result_layout)
 
 
-    def quiz_layout():
-        return ft.Column(
-            [
-                progress_text,
-                timer_display,
-                ft.Container(height=SPACE_SM),
-                question_text,
-                ft.Container(height=SPACE_SM),
-                radio_group,
-                ft.Container(height=SPACE_MD),
+    # Built once and reused by every session
+    quiz_view = ft.Column(
+        [
+            progress_text,
+            timer_display,
+            ft.Container(height=SPACE_SM),
+            question_text,
+            ft.Container(height=SPACE_SM),
+            radio_group,
+            ft.Container(height=SPACE_MD),
 
-                ft.ElevatedButton("Submit Answer", on_click=next_question),
+            ft.ElevatedButton("Submit Answer", on_click=next_question),
+
+            explanation_container,
+
+            ft.Container(
+                content=continue_button,
+                margin=ft.margin.only(top=SPACE_MD, bottom=SPACE_LG)
+            ),
+        ],
+        spacing=SPACE_SM,
+        scroll=ft.ScrollMode.AUTO,
+        expand=True
+    )
+
+    def quiz_layout():
+        return quiz_view
 
-                explanation_container,
 
-                ft.Container(
-                    content=continue_button,
-                    margin=ft.margin.only(top=SPACE_MD, bottom=SPACE_LG)
-                ),
-            ],
-            spacing=SPACE_SM,
-            scroll=ft.ScrollMode.AUTO,
-            expand=True
-        )
 
 
 
+    def end_session(e=None):
+        nonlocal session, journal
 
+        if session is not None:
+            EXAM_CLOCK.remove(session.id)
+            ENGINE.abandon(session)
+            session = None
 
-    def start_practice(e):
-        nonlocal current_question_index, score, quiz_questions
-        nonlocal total_questions, domain_correct, domain_total, mode
-        nonlocal timer_running
+        # Answers of an abandoned session still count for spaced repetition
+        if review_rows:
+            db.queue_reviews(review_rows[:])
+            review_rows.clear()
 
-        # 🔥 STOP TIMER
-        timer_running = False
         timer_display.value = ""
-        
-        mode = "Practice"
 
-        free_questions = [q for q in QUESTIONS if not q.get("is_pro", False)]
+        # Leave the journal on disk so the exam can be resumed
+        if journal is not None:
+            journal.close()
+            journal = None
 
-        quiz_questions = random.sample(
-            free_questions,
-            min(25, len(free_questions))
-        )
+    # Drop the engine's session when the page session expires
+    def on_close(e):
+        end_session()
+        updates.report()
 
-        total_questions = len(quiz_questions)
-        current_question_index = 0
-        score = 0
-        domain_correct = {}
-        domain_total = {}
+    page.on_close = on_close
 
-        timer_display.value = ""
+    def begin_session(mode, question_ids, time_limit=None):
+        nonlocal session, journal
+
+        end_session()
+        session = ENGINE.start(mode, question_ids, time_limit)
+
+        # Timed sessions are journaled answer by answer
+        if time_limit:
+            journal = SessionJournal.create(session)
+
+    async def start_practice(e):
+        # Unseen questions first, then missed ones, then the rest
+        begin_session("Practice", PROGRESS.sample(QUESTION_INDEX.mask(tier=TIER_FREE), 25))
 
         switch_content(quiz_layout())
         show_question()
 
-    # 🔥 ADD THESE FUNCTIONS HERE
+    def reviewable(question_id):
+        # Still in the bank, and not behind the paywall on a free page
+        return question_id in BANK and (is_pro_user or not BANK.is_pro(question_id))
 
-    def get_weakest_domain():
-        attempts = get_attempts()
+    async def start_review(e):
+        # Due questions first, oldest due first, then ones never answered
+        question_ids = await db.get_due_reviews(REVIEW_SIZE, include_pro=is_pro_user)
 
-        if not attempts:
-            return None
+        if len(question_ids) < REVIEW_SIZE:
+            unseen = REVIEWS.unseen(QUESTION_INDEX.pool(None if is_pro_user else TIER_FREE))
+            question_ids += random.sample(unseen, min(REVIEW_SIZE - len(question_ids), len(unseen)))
 
-        latest = attempts[-1]
-        domain_stats = latest.get("domain_stats", {})
+        if not question_ids:
+            show_home()
+            return
 
-        performance = {}
+        begin_session("Review", question_ids)
 
-        for domain, stats in domain_stats.items():
-            if stats["total"] > 0:
-                performance[domain] = stats["correct"] / stats["total"]
+        switch_content(quiz_layout())
+        show_question()
 
-        if not performance:
-            return None
+    # 🔥 ADD THESE FUNCTIONS HERE
 
-        return min(performance, key=performance.get)
+    async def start_mock(e):
+        if not is_pro_user:
+            show_upgrade_screen()
+            return
 
+        unfinished = await asyncio.to_thread(session_journal.pending, "Mock")
+        if unfinished is not None:
+            show_resume_screen(unfinished)
+            return
 
-    def generate_adaptive_mock(questions):
+        await start_new_mock()
 
-        weakest = get_weakest_domain()
+    async def start_adaptive(e):
+        nonlocal session
 
-        # Filter only Pro questions
-        pro_questions = [q for q in questions if q.get("is_pro", False)]
+        if not is_pro_user:
+            show_upgrade_screen()
+            return
 
-        # Group by category dynamically
-        category_groups = {}
-        for q in pro_questions:
-            cat = q["category"]
-            category_groups.setdefault(cat, []).append(q)
+        end_session()
+        session = ENGINE.start_adaptive(ADAPTIVE_ITEMS, ())
 
-        # Default: evenly distribute across categories
-        total_questions = 180
-        num_categories = len(category_groups)
-        base_count = total_questions // num_categories
+        switch_content(quiz_layout())
+        show_question()
 
-        dist = {cat: base_count for cat in category_groups}
+    async def start_new_mock(discard_path=None):
+        if discard_path is not None:
+            await asyncio.to_thread(session_journal.discard, discard_path)
 
-        # Adjust remainder
-        remainder = total_questions - (base_count * num_categories)
-        for i, cat in enumerate(dist):
-            if i < remainder:
-                dist[cat] += 1
+        # Pre-assembled form for the current weakness profile; only build
+        # one inline if the background pool has not caught up yet
+        form = MOCK_FORMS.take()
+        if form is None:
+            form = await asyncio.to_thread(MOCK_FORMS.generate, MOCK_FORMS.profile)
 
-        # Boost weakest category
-        if weakest and weakest in dist:
-            dist[weakest] += 10
+        begin_session("Mock", form, MOCK_TIME_LIMIT)
 
-            # Reduce others slightly
-            for cat in dist:
-                if cat != weakest and dist[cat] > 5:
-                    dist[cat] -= 1
+        switch_content(quiz_layout())
+        show_question()
 
-        # Select questions
-        selected = []
-        for cat, count in dist.items():
-            pool = category_groups[cat]
-            selected += random.sample(pool, min(count, len(pool)))
+        start_timer()
 
-        random.shuffle(selected)
+    async def resume_mock(unfinished):
+        nonlocal session, journal
 
-        return selected
+        end_session()
 
-    def start_mock(e):
-        nonlocal current_question_index, score, quiz_questions
-        nonlocal total_questions, domain_correct, domain_total, mode
-        nonlocal is_pro_user
+        try:
+            session, journal = await asyncio.to_thread(
+                session_journal.resume, unfinished["path"], ENGINE
+            )
+        except (session_journal.JournalInUse, FileNotFoundError):
+            # Resumed, submitted or discarded by another page since it was
+            # offered; offer whatever is left instead
+            await start_mock(None)
+            return
 
-        if not is_pro_user:
-            show_upgrade_screen()
+        switch_content(quiz_layout())
+
+        if session.finished:
+            await submit_exam(None)
             return
 
-        mode = "Mock"
+        show_question()
+        start_timer()
 
-        # Load ALL questions for Pro
-        quiz_questions = generate_adaptive_mock(QUESTIONS)
+    def show_resume_screen(unfinished):
+        mins, secs = divmod(int(unfinished["remaining"] or 0), 60)
 
-        total_questions = len(quiz_questions)
-        current_question_index = 0
-        score = 0
-        domain_correct = {}
-        domain_total = {}
+        async def on_resume(e):
+            await resume_mock(unfinished)
 
-        timer_display.value = ""
-        switch_content(quiz_layout())
-        show_question()
+        async def on_start_new(e):
+            await start_new_mock(unfinished["path"])
 
-        start_timer(10800)  # 180 minutes real PMP
+        resume_layout = ft.Column(
+            [
+                ft.Text("Unfinished Mock Exam", size=22, weight="bold"),
+                ft.Text(
+                    f"{unfinished['answered']}/{len(unfinished['question_ids'])} answered • "
+                    f"{mins:02}:{secs:02} left"
+                ),
+                ft.Container(height=SPACE_MD),
+                primary_button("Resume Exam", on_resume),
+                ft.TextButton("Start a New Mock", on_click=on_start_new),
+            ],
+            horizontal_alignment="center",
+            spacing=SPACE_SM
+        )
+
+        switch_content(resume_layout)
 
 
 
@@ -415,14 +601,78 @@ def main(page: ft.Page):
     # ================= RESULTS ===========================
     # =====================================================
 
-    def show_results():
-        attempts = get_attempts()
+    RESULTS_ROW_HEIGHT = 52
 
-        table_column = ft.Column(
-            scroll=ft.ScrollMode.AUTO,
-            expand=True
+    def results_row(i, attempt, styles):
+        row = ft.Container(
+            content=ft.Row(
+                [
+                    ft.Text(str(attempt["date"]), expand=3),
+                    ft.Text(str(attempt["mode"]), expand=2),
+                    ft.Text(
+                        f"{attempt['score']}/{attempt['total']}",
+                        expand=2
+                    ),
+                    ft.Text(
+                        f"{attempt['percentage']:.2f}%",
+                        expand=2
+                    ),
+                ]
+            ),
+            padding=SPACE_SM,
+            height=RESULTS_ROW_HEIGHT
+        )
+
+        # Alternate row color
+        return theme_style(
+            styles, row, "bgcolor",
+            BRAND_CARD_BG if i % 2 == 0 else "#EEF1F8", BRAND_DARK_CARD
+        )
+
+    def results_layout(first_page, styles):
+        # Newest first, one keyset page at a time as the user scrolls
+        results_state = {"before_id": None, "done": False, "loading": False}
+
+        results_list = ft.ListView(
+            expand=True,
+            item_extent=RESULTS_ROW_HEIGHT,
+            build_controls_on_demand=True,
         )
 
+        def add_page(attempts):
+            offset = len(results_list.controls)
+
+            results_list.controls.extend(
+                results_row(offset + i, attempt, styles)
+                for i, attempt in enumerate(attempts)
+            )
+
+            if attempts:
+                results_state["before_id"] = attempts[-1]["id"]
+            if len(attempts) < ATTEMPTS_PAGE_SIZE:
+                results_state["done"] = True
+
+        async def load_page():
+            if results_state["done"] or results_state["loading"]:
+                return False
+
+            results_state["loading"] = True
+
+            attempts = await db.get_cached_attempts_page(results_state["before_id"])
+            add_page(attempts)
+
+            results_state["loading"] = False
+            return bool(attempts)
+
+        async def on_results_scroll(e):
+            # Fetch the next page once within two screens of the end
+            if e.max_scroll_extent - e.pixels < 2 * e.viewport_dimension:
+                if await load_page():
+                    updates.request(results_list)
+
+        results_list.on_scroll = on_results_scroll
+        add_page(first_page)
+
         header_row = ft.Container(
             content=ft.Row(
                 [
@@ -436,126 +686,73 @@ def main(page: ft.Page):
             bgcolor=BRAND_PRIMARY
         )
 
-        table_column.controls.append(header_row)
-
-        for i, attempt in enumerate(attempts):
-
-            # Alternate row color
-            if page.theme_mode == ft.ThemeMode.DARK:
-                row_bg = BRAND_DARK_CARD
-            else:
-                row_bg = BRAND_CARD_BG if i % 2 == 0 else "#EEF1F8"
-
-            row = ft.Container(
-                content=ft.Row(
-                    [
-                        ft.Text(str(attempt["date"]), expand=3),
-                        ft.Text(str(attempt["mode"]), expand=2),
-                        ft.Text(
-                            f"{attempt['score']}/{attempt['total']}",
-                            expand=2
-                        ),
-                        ft.Text(
-                            f"{attempt['percentage']:.2f}%",
-                            expand=2
-                        ),
-                    ]
-                ),
-                padding=SPACE_SM,
-                bgcolor=row_bg
-            )
-
-            table_column.controls.append(row)
+        return ft.Column([header_row, results_list], spacing=0, expand=True)
 
-        switch_content(table_column)
+    async def show_results():
+        # Same first page until an attempt is saved, so the rows already
+        # built (and any pages scrolled in since) are shown as they are
+        first_page = await db.get_cached_attempts_page()
+        switch_content(cached_screen("results", first_page, results_layout))
 
 
     # =====================================================
     # ================= ANALYTICS =========================
     # =====================================================
 
-    def show_analytics():
-        if not is_pro_user:
-            show_basic_analytics()
-        else:
-            show_advanced_analytics()
-
-    def show_basic_analytics():
-        all_attempts = get_attempts()
-
-        # ---------------- FILTER ONLY PRACTICE ATTEMPTS ----------------
-        attempts = [a for a in all_attempts if a["mode"] == "Practice"]
-
-        if not attempts:
-            switch_content(
-                ft.Column(
-                    [ft.Text("No practice attempts yet.", size=18, weight="bold")],
-                    horizontal_alignment="center",
-                    expand=True
-                )
-            )
-            return
+    def themed_text(styles, *args, **kwargs):
+        # Dark mode text fix
+        return theme_style(styles, ft.Text(*args, **kwargs), "color", ft.Colors.BLACK, ft.Colors.WHITE)
 
-        # ---------------- BASIC METRICS ----------------
-        percentages = [a["percentage"] for a in attempts]
-        total_attempts = len(attempts)
+    def themed_card(styles, content):
+        card = ft.Container(content=content, padding=SPACE_MD, border_radius=10)
+        return theme_style(styles, card, "bgcolor", BRAND_CARD_BG, BRAND_DARK_CARD)
 
-        lifetime_avg = sum(percentages) / total_attempts
-        best_score = max(percentages)
+    def no_attempts_layout(message):
+        return ft.Column(
+            [ft.Text(message, size=18, weight="bold")],
+            horizontal_alignment="center",
+            expand=True
+        )
 
-        last_5 = percentages[-5:]
-        last_5_avg = sum(last_5) / len(last_5)
+    async def show_analytics():
+        if not is_pro_user:
+            await show_basic_analytics()
+        else:
+            await show_advanced_analytics()
 
-        # ---------------- THEME COLORS ----------------
-        text_color = (
-            ft.Colors.WHITE if page.theme_mode == ft.ThemeMode.DARK
-            else ft.Colors.BLACK
-        )
+    async def show_basic_analytics():
+        # ---------------- ONLY PRACTICE ATTEMPTS ----------------
+        view = await db.get_analytics_view("Practice")
+        switch_content(cached_screen("Practice", view, basic_analytics_layout))
 
-        card_bg = (
-            BRAND_DARK_CARD if page.theme_mode == ft.ThemeMode.DARK
-            else BRAND_CARD_BG
-        )
+    def basic_analytics_layout(view, styles):
+        if view is None:
+            return no_attempts_layout("No practice attempts yet.")
 
-        # ---------------- LAYOUT ----------------
-        analytics_layout = ft.Column(
+        return ft.Column(
             [
-                ft.Text(
-                    "Practice Performance Overview",
-                    size=20,
-                    weight="bold",
-                    color=text_color
-                ),
+                themed_text(styles, "Practice Performance Overview", size=20, weight="bold"),
 
                 ft.Container(height=SPACE_SM),
 
-                ft.Text(f"Lifetime Average: {lifetime_avg:.2f}%", color=text_color),
-                ft.Text(f"Best Score: {best_score:.2f}%", color=text_color),
-                ft.Text(f"Total Attempts: {total_attempts}", color=text_color),
-                ft.Text(f"Last 5 Attempts Avg: {last_5_avg:.2f}%", color=text_color),
+                themed_text(styles, f"Lifetime Average: {view['lifetime_avg']:.2f}%"),
+                themed_text(styles, f"Best Score: {view['best_score']:.2f}%"),
+                themed_text(styles, f"Total Attempts: {view['attempts']}"),
+                themed_text(styles, f"Last 5 Attempts Avg: {view['last_5_avg']:.2f}%"),
 
                 ft.Container(height=SPACE_MD),
 
                 # -------- VALUE ANCHOR CARD --------
-                ft.Container(
-                    content=ft.Column(
-                        [
-                            ft.Text(
-                                "Unlock Advanced Analytics",
-                                weight="bold",
-                                color=text_color
-                            ),
-                            ft.Text(
-                                "Get Exam Readiness Score, Domain Coverage, "
-                                "Weakness Severity & Consistency Tracking.",
-                                color=text_color
-                            )
-                        ]
-                    ),
-                    padding=SPACE_MD,
-                    bgcolor=card_bg,
-                    border_radius=10
-                ),
+                themed_card(styles, ft.Column(
+                    [
+                        themed_text(styles, "Unlock Advanced Analytics", weight="bold"),
+                        themed_text(
+                            styles,
+                            "Get Exam Readiness Score, Domain Coverage, "
+                            "Weakness Severity & Consistency Tracking."
+                        )
+                    ]
+                )),
 
                 ft.Container(height=SPACE_SM),
 
@@ -571,216 +768,147 @@ def main(page: ft.Page):
             spacing=SPACE_SM
         )
 
-        switch_content(analytics_layout)
-
-
-    def show_advanced_analytics():
-        all_attempts = get_attempts()
-
-        # ---------------- FILTER ONLY MOCK ATTEMPTS ----------------
-        attempts = [a for a in all_attempts if a["mode"] == "Mock"]
-
-        if not attempts:
-            switch_content(
-                ft.Column(
-                    [ft.Text("No mock attempts yet.", size=18, weight="bold")],
-                    horizontal_alignment="center",
-                    expand=True
-                )
-            )
-            return
-
-        # ---------------- BASIC METRICS ----------------
-        percentages = [a["percentage"] for a in attempts]
-        total_attempts = len(attempts)
-
-        lifetime_avg = sum(percentages) / total_attempts
-        best_score = max(percentages)
-
-        last_5 = percentages[-5:]
-        last_5_avg = sum(last_5) / len(last_5)
-
-        total_questions_attempted = sum(a["total"] for a in attempts)
-
-        # ---------------- DOMAIN AGGREGATION ----------------
-        domain_scores = {}
-
-        for a in attempts:
-            domain_stats = a.get("domain_stats", {})
-
-            if not isinstance(domain_stats, dict):
-                continue
-
-            for domain, stats in domain_stats.items():
-
-                if not isinstance(stats, dict):
-                    continue
-
-                correct = stats.get("correct", 0)
-                total = stats.get("total", 0)
-
-                if total > 0:
-                    percent = (correct / total) * 100
-                    domain_scores.setdefault(domain, []).append(percent)
-
-        averaged_domains = {
-            d: sum(v) / len(v)
-            for d, v in domain_scores.items()
-            if len(v) > 0
-        }
-
-        if averaged_domains:
-            strongest_domain = max(averaged_domains, key=averaged_domains.get)
-            weakest_domain = min(averaged_domains, key=averaged_domains.get)
-        else:
-            strongest_domain = "N/A"
-            weakest_domain = "N/A"
-
-        # ---------------- DOMAIN COVERAGE ----------------
-        total_possible_domains = 10
-        domains_attempted = len(averaged_domains)
-
-        # ---------------- PERFORMANCE TREND ----------------
-        if last_5_avg > lifetime_avg:
-            performance_pattern = "Improving 📈"
-        elif last_5_avg < lifetime_avg:
-            performance_pattern = "Declining 📉"
-        else:
-            performance_pattern = "Stable ➖"
-
-        # ---------------- CONSISTENCY SCORE ----------------
-        if len(last_5) > 1:
-            mean = last_5_avg
-            variance = sum((x - mean) ** 2 for x in last_5) / len(last_5)
-            stability_score = max(0, 100 - variance)
-        else:
-            stability_score = 100
-
-        # ---------------- EXAM READINESS SCORE ----------------
-        domain_balance_score = (
-            sum(averaged_domains.values()) / len(averaged_domains)
-            if averaged_domains else 0
-        )
-
-        readiness_score = (
-            (last_5_avg * 0.5) +
-            (lifetime_avg * 0.3) +
-            (domain_balance_score * 0.2)
-        )
-
-        readiness_score = min(100, readiness_score)
-
-        # ---------------- WEAKNESS SEVERITY ----------------
-        weakest_percent = averaged_domains.get(weakest_domain, 0)
-
-        if weakest_percent < 50:
-            weakness_level = "Critical Weakness"
-        elif weakest_percent < 70:
-            weakness_level = "Moderate Weakness"
-        else:
-            weakness_level = "Minor Weakness"
-
-        # ---------------- SMART RECOMMENDATION ----------------
-        if readiness_score >= 80:
-            recommendation = "You are exam-ready. Focus on mock simulation endurance."
-        elif readiness_score >= 60:
-            recommendation = "Good progress. Strengthen weak domains and improve stability."
-        else:
-            recommendation = "Focus on fundamentals. Increase structured practice."
-
-        # ---------------- DARK MODE TEXT FIX ----------------
-        text_color = (
-            ft.Colors.WHITE if page.theme_mode == ft.ThemeMode.DARK
-            else ft.Colors.BLACK
-        )
+    async def show_advanced_analytics():
+        # ---------------- ONLY MOCK ATTEMPTS ----------------
+        view = await db.get_analytics_view("Mock")
+        switch_content(cached_screen("Mock", view, advanced_analytics_layout))
 
-        card_bg = (
-            BRAND_DARK_CARD if page.theme_mode == ft.ThemeMode.DARK
-            else BRAND_CARD_BG
-        )
+    def advanced_analytics_layout(view, styles):
+        if view is None:
+            return no_attempts_layout("No mock attempts yet.")
 
-        # ---------------- UI LAYOUT ----------------
-        analytics_layout = ft.Column(
+        return ft.Column(
             [
-                ft.Text(
-                    "Advanced Performance Analytics",
-                    size=20,
-                    weight="bold",
-                    color=text_color
-                ),
+                themed_text(styles, "Advanced Performance Analytics", size=20, weight="bold"),
 
                 ft.Container(height=SPACE_SM),
 
-                ft.Text(
-                    f"Exam Readiness Score: {readiness_score:.1f} / 100",
-                    weight="bold",
-                    color=text_color
-                ),
+                themed_text(styles, f"Exam Readiness Score: {view['readiness']:.1f} / 100", weight="bold"),
 
                 ft.Container(height=SPACE_SM),
 
-                ft.Text(f"Lifetime Average: {lifetime_avg:.2f}%", color=text_color),
-                ft.Text(f"Best Score: {best_score:.2f}%", color=text_color),
-                ft.Text(f"Last 5 Attempts Avg: {last_5_avg:.2f}%", color=text_color),
-                ft.Text(f"Total Attempts: {total_attempts}", color=text_color),
-                ft.Text(f"Total Questions Attempted: {total_questions_attempted}", color=text_color),
+                themed_text(styles, f"Lifetime Average: {view['lifetime_avg']:.2f}%"),
+                themed_text(styles, f"Best Score: {view['best_score']:.2f}%"),
+                themed_text(styles, f"Last 5 Attempts Avg: {view['last_5_avg']:.2f}%"),
+                themed_text(styles, f"Total Attempts: {view['attempts']}"),
+                themed_text(styles, f"Total Questions Attempted: {view['total_questions']}"),
 
                 ft.Container(height=SPACE_SM),
 
-                ft.Text(
-                    f"Domains Attempted: {domains_attempted} / {total_possible_domains}",
-                    color=text_color
-                ),
+                themed_text(styles, f"Domains Attempted: {view['domains_attempted']} / {view['total_domains']}"),
 
                 ft.Container(height=SPACE_SM),
 
                 ft.Text(
-                    f"Strongest Domain: {strongest_domain} "
-                    f"({averaged_domains.get(strongest_domain, 0):.2f}%)",
+                    f"Strongest Domain: {view['strongest_domain']} "
+                    f"({view['strongest_percent']:.2f}%)",
                     color=ft.Colors.GREEN
                 ),
 
                 ft.Text(
-                    f"Weakest Domain: {weakest_domain} "
-                    f"({weakest_percent:.2f}%) - {weakness_level}",
+                    f"Weakest Domain: {view['weakest_domain']} "
+                    f"({view['weakest_percent']:.2f}%) - {view['weakness_level']}",
                     color=ft.Colors.RED
                 ),
 
                 ft.Container(height=SPACE_SM),
 
-                ft.Text(f"Performance Trend: {performance_pattern}", color=text_color),
-                ft.Text(f"Consistency Score: {stability_score:.1f} / 100", color=text_color),
+                themed_text(styles, f"Performance Trend: {view['trend']}"),
+                themed_text(styles, f"Consistency Score: {view['stability']:.1f} / 100"),
 
                 ft.Container(height=SPACE_MD),
 
-                ft.Container(
-                    content=ft.Column(
-                        [
-                            ft.Text(
-                                "Smart Recommendation",
-                                weight="bold",
-                                color=text_color
-                            ),
-                            ft.Text(
-                                recommendation,
-                                color=text_color
-                            )
-                        ]
-                    ),
-                    padding=SPACE_MD,
-                    bgcolor=card_bg,
-                    border_radius=10
-                )
+                themed_card(styles, ft.Column(
+                    [
+                        themed_text(styles, "Smart Recommendation", weight="bold"),
+                        themed_text(styles, view["recommendation"])
+                    ]
+                ))
             ],
             scroll=ft.ScrollMode.AUTO,
             expand=True,
             spacing=SPACE_SM
         )
 
-        switch_content(analytics_layout)
 
+    # =====================================================
+    # ================= STUDY BY TOPIC ====================
+    # =====================================================
+
+    TOPIC_QUIZ_SIZE = 25
+
+    def topic_hit(hit):
+        # Snippet matches come back wrapped in HIGHLIGHT; render them bold
+        parts = hit["snippet"].split(HIGHLIGHT)
+
+        return ft.Container(
+            content=ft.Column(
+                [
+                    ft.Text(hit["category"], size=12, color=ft.Colors.GREY),
+                    ft.Text(spans=[
+                        ft.TextSpan(part, ft.TextStyle(weight=ft.FontWeight.BOLD) if i % 2 else None)
+                        for i, part in enumerate(parts)
+                    ]),
+                ],
+                spacing=2
+            ),
+            padding=SPACE_SM,
+            bgcolor=BRAND_CARD_BG if page.theme_mode == ft.ThemeMode.LIGHT else BRAND_DARK_CARD,
+            border_radius=10
+        )
 
+    def show_topic_search():
+        topic_state = {"ids": []}
 
+        async def run_search(e):
+            hits = await db.search_questions(
+                search_field.value or "", tier=None if is_pro_user else TIER_FREE
+            )
+
+            topic_state["ids"] = [hit["id"] for hit in hits[:TOPIC_QUIZ_SIZE]]
+
+            hits_list.controls = [topic_hit(hit) for hit in hits]
+            summary_text.value = f"Top {len(hits)} matches" if hits else "No matches"
+            start_button.content = f"Quiz on Top {len(topic_state['ids'])}"
+            start_button.disabled = not hits
+            updates.request(topic_layout)
+
+        async def start_topic_quiz(e):
+            if not topic_state["ids"]:
+                return
+
+            begin_session("Topic", topic_state["ids"])
+
+            switch_content(quiz_layout())
+            show_question()
+
+        search_field = ft.TextField(
+            label="Search a topic, e.g. risk register",
+            on_submit=run_search,
+            autofocus=True,
+            expand=True
+        )
+        summary_text = ft.Text(size=12, color=ft.Colors.GREY)
+        hits_list = ft.ListView(expand=True, spacing=6)
+        start_button = primary_button("Quiz on Results", start_topic_quiz)
+        start_button.disabled = True
+
+        topic_layout = ft.Column(
+            [
+                ft.Text("Study by Topic", size=22, weight="bold"),
+                ft.Row(
+                    [search_field, ft.IconButton(ft.Icons.SEARCH, on_click=run_search)]
+                ),
+                summary_text,
+                hits_list,
+                start_button,
+            ],
+            spacing=SPACE_SM,
+            expand=True,
+            horizontal_alignment="center"
+        )
+
+        switch_content(topic_layout)
 
     # =====================================================
     # ================= HOME ==============================
@@ -807,7 +935,27 @@ def main(page: ft.Page):
                     spacing=4
                 ),
                 ft.Container(height=SPACE_SM),
+                ft.Column(
+                    [
+                        primary_button("Review Due", start_review),
+                        ft.Text(f"{REVIEWS.due_count(include=reviewable)} due now • Spaced repetition", size=12, color=ft.Colors.GREY)
+                    ],
+                    horizontal_alignment="center",
+                    spacing=4
+                ),
+                ft.Container(height=SPACE_SM),
                 primary_button("Mock Exam Mode", start_mock),
+                ft.Container(height=SPACE_SM),
+                ft.Column(
+                    [
+                        primary_button("Adaptive Exam", start_adaptive),
+                        ft.Text("Ends once your level is measured • Pro", size=12, color=ft.Colors.GREY)
+                    ],
+                    horizontal_alignment="center",
+                    spacing=4
+                ),
+                ft.Container(height=SPACE_SM),
+                primary_button("Study by Topic", lambda e: show_topic_search()),
             ],
             horizontal_alignment="center",
             spacing=SPACE_SM
@@ -821,14 +969,14 @@ def main(page: ft.Page):
 
     def close_dialog(dialog):
         dialog.open = False
-        page.update()
+        updates.request()
 
 
     def activate_pro(dialog):
         nonlocal is_pro_user
         is_pro_user = True
         dialog.open = False
-        page.update()
+        updates.request()
 
 
     def show_upgrade_screen():
@@ -904,13 +1052,13 @@ def main(page: ft.Page):
     # ================= NAVIGATION ========================
     # =====================================================
 
-    def on_tab_change(e):
+    async def on_tab_change(e):
         if e.control.selected_index == 0:
             show_home()
         elif e.control.selected_index == 1:
-            show_results()
+            await show_results()
         elif e.control.selected_index == 2:
-            show_analytics()
+            await show_analytics()
 
     navigation = ft.NavigationBar(
         selected_index=0,
@@ -939,14 +1087,26 @@ def main(page: ft.Page):
     page.add(splash)
 
     async def load_app():
-        await asyncio.sleep(1.5)
-        page.controls.clear()
-        page.add(ft.Column([header, content_area, navigation], expand=True))
+        # Right away on a warm process; a cold one finishes STARTUP first
+        try:
+            await STARTUP.ready()
+        except Exception as e:
+            # Nothing works without the database and question bank, so say
+            # why on the splash instead of leaving it up for good
+            splash.content.controls[1:] = [
+                ft.Text("Could not start the app.", size=16, color=ft.Colors.RED),
+                ft.Text(str(e) or type(e).__name__, size=12, selectable=True),
+            ]
+            updates.request(splash)
+            return
+
+        page.controls[:] = [ft.Column([header, content_area, navigation], expand=True)]
         show_home()
 
     page.run_task(load_app)
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
     port = int(os.environ.get("PORT", 8000))
     ft.app(target=main, port=port)
@@ -0,0 +1,66 @@
+import random
+
+from database import LOCAL_USER, get_progress
+from question_bank import mask_to_ids
+
+
+class QuestionProgress:
+    # Which questions a user has seen, and which they got right the last
+    # time, as bitsets over question ids. Stored as two BLOBs per user:
+    # ~1.25 KB each for a 10k-question bank.
+    def __init__(self, user_id=LOCAL_USER, seen=0, correct=0):
+        self.user_id = user_id
+        self.seen = seen
+        self.correct = correct
+
+    @classmethod
+    def load(cls, user_id=LOCAL_USER):
+        seen, correct = get_progress(user_id)
+
+        return cls(user_id, int.from_bytes(seen, "little"), int.from_bytes(correct, "little"))
+
+    def update(self, responses):
+        # responses: QuizSession.response_rows(); called once per session.
+        # Returns the session's (answered, right) bits for merge_progress()
+        answered = 0
+        right = 0
+
+        for question_id, _, correct, _ in responses:
+            answered |= 1 << question_id
+            if correct:
+                right |= 1 << question_id
+
+        self.seen |= answered
+        self.correct = (self.correct & ~answered) | right
+
+        return answered, right
+
+    def refresh(self, seen, correct):
+        # The stored bitsets, which include sessions saved by other workers
+        self.seen = seen
+        self.correct = correct
+
+    def row(self):
+        return (
+            self.user_id,
+            self.seen.to_bytes((self.seen.bit_length() + 7) // 8, "little"),
+            self.correct.to_bytes((self.correct.bit_length() + 7) // 8, "little")
+        )
+
+    def sample(self, pool_mask, k, rng=random):
+        # Unseen questions first, then ones last answered wrong, then the rest
+        picked = []
+
+        for mask in (
+            pool_mask & ~self.seen,
+            pool_mask & self.seen & ~self.correct,
+            pool_mask & self.correct
+        ):
+            if len(picked) >= k:
+                break
+
+            ids = mask_to_ids(mask).tolist()
+            picked += rng.sample(ids, min(k - len(picked), len(ids)))
+
+        rng.shuffle(picked)
+        return picked
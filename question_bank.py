@@ -0,0 +1,527 @@
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+
+import numpy as np
+
+import bank_compiler
+from database import get_connection
+
+QUESTIONS_FILE = "questions.json"
+
+# ---------------- SQL ----------------
+SQL_INSERT_QUESTION = """
+    INSERT INTO questions (
+        id, question, options, correct_answer, category, subcategory,
+        difficulty, is_pro, explanation
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+SQL_SELECT_QUESTION_KEYS = "SELECT key, id FROM question_keys"
+
+SQL_INSERT_QUESTION_KEY = "INSERT INTO question_keys (key, id) VALUES (?, ?)"
+
+SQL_SELECT_QUESTION_COLUMNS = """
+    SELECT id, question, options, correct_answer, category, subcategory,
+           difficulty, is_pro, explanation
+    FROM questions
+"""
+
+SQL_SELECT_META = "SELECT id, category, difficulty, is_pro FROM questions"
+
+SQL_SELECT_COMPACT_META = """
+    SELECT id, category, difficulty, is_pro, correct_answer
+    FROM questions ORDER BY id
+"""
+
+# ---------------- FULL-TEXT SEARCH ----------------
+# FTS5 index over the question text, options and explanation, keyed by
+# question id and rebuilt from the questions table on every import. Options
+# are indexed as plain text so snippets never show the stored JSON; is_pro
+# rides along unindexed so the tier filter never leaves the index.
+SQL_FILL_FTS = """
+    INSERT INTO questions_fts (rowid, question, options, explanation, is_pro)
+    SELECT id, question,
+           (SELECT group_concat(value, ' · ') FROM json_each(questions.options)),
+           explanation, is_pro
+    FROM questions
+"""
+
+# Default rank: bm25 weighted question, options, explanation (is_pro unused)
+SQL_RANK_FTS = """
+    INSERT INTO questions_fts (questions_fts, rank) VALUES ('rank', 'bm25(4.0, 1.0, 2.0, 0.0)')
+"""
+
+# ORDER BY rank LIMIT lets FTS5 rank and cut the matches itself, so snippets
+# and the category lookup only run for the hits returned.
+SQL_SEARCH = """
+    WITH top AS (
+        SELECT rowid AS id, is_pro,
+               snippet(questions_fts, -1, :mark, :mark, '…', 16) AS snippet,
+               rank
+        FROM questions_fts
+        WHERE questions_fts MATCH :query AND is_pro <= :max_pro
+        ORDER BY rank
+        LIMIT :limit
+    )
+    SELECT top.id, q.category, top.is_pro, top.snippet, top.rank
+    FROM top
+    JOIN questions q ON q.id = top.id
+    ORDER BY top.rank
+"""
+
+SEARCH_LIMIT = 25
+HIGHLIGHT = "**"
+
+TIER_FREE = "free"
+TIER_PRO = "pro"
+
+
+def init_bank(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS questions (
+            id INTEGER PRIMARY KEY,
+            question TEXT NOT NULL,
+            options TEXT NOT NULL,
+            correct_answer INTEGER NOT NULL,
+            category TEXT NOT NULL,
+            subcategory TEXT,
+            difficulty TEXT,
+            is_pro INTEGER NOT NULL DEFAULT 0,
+            explanation TEXT
+        )
+    """)
+
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_questions_category ON questions(category)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_questions_difficulty ON questions(difficulty)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_questions_is_pro ON questions(is_pro)")
+
+    conn.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS questions_fts USING fts5(
+            question, options, explanation, is_pro UNINDEXED,
+            tokenize='porter unicode61'
+        )
+    """)
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS question_keys (
+            key TEXT PRIMARY KEY,
+            id INTEGER NOT NULL UNIQUE
+        )
+    """)
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS bank_meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        )
+    """)
+
+
+def file_hash(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+# ---------------- STABLE IDS ----------------
+# Responses, review schedules, progress bitsets, item calibration and
+# session journals are all keyed by question id, so a question keeps its id
+# across re-imports. It is recognised by its "key" in questions.json when it
+# has one, otherwise by its text and options (editing those makes it a new
+# question). Ids are never reused, so removing a question can never move
+# its history onto another one.
+#
+# Arrays and bitsets indexed by id (LazyBank, progress bitsets) grow with
+# the highest id ever issued, so that is capped: a bank that keeps being
+# rewritten without keys is refused instead of growing them without bound.
+MAX_QUESTION_ID = (1 << 20) - 1
+
+def question_key(q):
+    if q.get("key"):
+        return "key:" + q["key"]
+
+    content = json.dumps([q["question"].strip(), q["options"]], ensure_ascii=False)
+    return "text:" + hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def assign_ids(conn, questions):
+    # Ids for questions, in order; new questions get ids past every id
+    # ever handed out
+    known = dict(conn.execute(SQL_SELECT_QUESTION_KEYS))
+
+    if not known:
+        # Bank imported before keys existed: its questions keep their ids
+        legacy = [_row_to_question(row) for row in conn.execute(SQL_SELECT_QUESTION_COLUMNS + " ORDER BY id")]
+        known = dict(zip(_unique_keys(legacy), (q["id"] for q in legacy)))
+        conn.executemany(SQL_INSERT_QUESTION_KEY, known.items())
+
+    next_id = max(known.values(), default=-1) + 1
+    ids = []
+    added = []
+
+    for key in _unique_keys(questions):
+        if key not in known:
+            known[key] = next_id
+            added.append((key, next_id))
+            next_id += 1
+        ids.append(known[key])
+
+    if next_id - 1 > MAX_QUESTION_ID:
+        raise bank_compiler.BankError([
+            f"{len(added)} new question(s) would need ids up to {next_id - 1}, past "
+            f"{MAX_QUESTION_ID}; give edited questions a \"key\" so they keep their ids"
+        ])
+
+    conn.executemany(SQL_INSERT_QUESTION_KEY, added)
+    return ids
+
+
+def _unique_keys(questions):
+    # Identical questions without a key are told apart by their order
+    seen = set()
+
+    for q in questions:
+        key = base = question_key(q)
+        n = 1
+        while key in seen:
+            n += 1
+            key = f"{base}#{n}"
+        seen.add(key)
+        yield key
+
+
+def build_bank(path=QUESTIONS_FILE, force=False):
+    # Idempotent: only re-imports when the source content hash changes.
+    # A compiled bank next to the JSON (see bank_compiler.py) is used unless
+    # the JSON is newer; its header carries the source hash, so checking an
+    # unchanged bank is one small read instead of hashing the whole JSON.
+    conn = get_connection()
+
+    compiled = bank_compiler.compiled_path(path)
+    use_compiled = os.path.exists(compiled) and (
+        not os.path.exists(path) or os.path.getmtime(compiled) >= os.path.getmtime(path)
+    )
+
+    if use_compiled:
+        try:
+            content_hash = bank_compiler.read_source_hash(compiled)
+        except ValueError:
+            # Older artifact format: import the JSON instead
+            use_compiled = False
+
+    if not use_compiled:
+        content_hash = file_hash(path)
+
+    with conn:
+        fts = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE name = 'questions_fts'"
+        ).fetchone()
+
+        if fts is not None and "is_pro" not in fts[0]:
+            # Index from before is_pro was stored in it
+            conn.execute("DROP TABLE questions_fts")
+            fts = None
+
+        init_bank(conn)
+
+        if fts is None:
+            conn.execute(SQL_RANK_FTS)
+
+        row = conn.execute(
+            "SELECT value FROM bank_meta WHERE key = 'content_hash'"
+        ).fetchone()
+
+        if row and row[0] == content_hash and not force:
+            # Bank imported before the search index (or its layout) existed
+            if fts is None:
+                conn.execute(SQL_FILL_FTS)
+            return False
+
+        if use_compiled:
+            questions = list(bank_compiler.load(compiled))
+        else:
+            with open(path, "r", encoding="utf-8") as f:
+                questions = json.load(f)
+
+            errors = bank_compiler.validate(questions)
+            if errors:
+                raise bank_compiler.BankError(errors)
+
+        ids = assign_ids(conn, questions)
+        conn.execute("DELETE FROM questions")
+
+        conn.executemany(SQL_INSERT_QUESTION, [
+            (
+                question_id,
+                q["question"],
+                json.dumps(q["options"]),
+                q["correct_answer"],
+                q["category"],
+                q.get("subcategory"),
+                q.get("difficulty"),
+                int(bool(q.get("is_pro", False))),
+                q.get("explanation")
+            )
+            for question_id, q in zip(ids, questions)
+        ])
+
+        conn.execute("DELETE FROM questions_fts")
+        conn.execute(SQL_FILL_FTS)
+
+        conn.execute(
+            "INSERT OR REPLACE INTO bank_meta (key, value) VALUES ('content_hash', ?)",
+            (content_hash,)
+        )
+
+    invalidate_index()
+
+    return True
+
+
+def _row_to_question(row):
+    return {
+        "id": row[0],
+        "question": row[1],
+        "options": json.loads(row[2]),
+        "correct_answer": row[3],
+        "category": row[4],
+        "subcategory": row[5],
+        "difficulty": row[6],
+        "is_pro": bool(row[7]),
+        "explanation": row[8]
+    }
+
+
+def get_questions(is_pro=None, category=None):
+    conn = get_connection()
+
+    clauses = []
+    params = []
+
+    if is_pro is not None:
+        clauses.append("is_pro = ?")
+        params.append(int(is_pro))
+
+    if category is not None:
+        clauses.append("category = ?")
+        params.append(category)
+
+    sql = SQL_SELECT_QUESTION_COLUMNS
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+
+    return [_row_to_question(row) for row in conn.execute(sql + " ORDER BY id", params)]
+
+
+def get_question_meta(is_pro=None):
+    conn = get_connection()
+
+    if is_pro is None:
+        return conn.execute(SQL_SELECT_META).fetchall()
+
+    return conn.execute(SQL_SELECT_META + " WHERE is_pro = ?", (int(is_pro),)).fetchall()
+
+
+def match_expressions(text):
+    # Free text -> FTS5 queries, strictest first: every word, every word but
+    # one, then any word. Every word is quoted so user input can never be
+    # FTS syntax; the porter stemmer already matches "registers" to
+    # "register", and prefix terms were the slow path on large banks.
+    words = [f'"{w}"' for w in re.findall(r"\w+", text.lower())]
+    if not words:
+        return []
+
+    expressions = [" ".join(words)]
+
+    # Ranking scores every match, so narrow fallbacks come before the
+    # broad any-word one
+    if len(words) > 2:
+        expressions.append(" OR ".join(
+            "(" + " ".join(words[:i] + words[i + 1:]) + ")" for i in range(len(words))
+        ))
+
+    if len(words) > 1:
+        expressions.append(" OR ".join(words))
+
+    return expressions
+
+
+def search(text, limit=SEARCH_LIMIT, tier=None, highlight=HIGHLIGHT):
+    # Ranked hits as dicts with id, category, is_pro, snippet (matches
+    # wrapped in highlight) and score (bm25, lower is better). Falls back
+    # to fewer of the words when no question has them all.
+    conn = get_connection()
+    max_pro = 0 if tier == TIER_FREE else 1
+    rows = []
+
+    for expression in match_expressions(text):
+        rows = conn.execute(SQL_SEARCH, {
+            "query": expression,
+            "max_pro": max_pro,
+            "limit": limit,
+            "mark": highlight
+        }).fetchall()
+
+        if rows:
+            break
+
+    return [
+        {
+            "id": row[0],
+            "category": row[1],
+            "is_pro": bool(row[2]),
+            "snippet": row[3],
+            "score": row[4]
+        }
+        for row in rows
+    ]
+
+
+# ---------------- BITSETS ----------------
+# Sets of question ids as Python ints, bit i standing for question id i
+
+def ids_to_mask(ids):
+    ids = np.asarray(ids, dtype=np.int64)
+    if not len(ids):
+        return 0
+
+    bits = np.zeros(int(ids.max()) + 1, dtype=np.uint8)
+    bits[ids] = 1
+
+    return int.from_bytes(np.packbits(bits, bitorder="little").tobytes(), "little")
+
+
+def mask_to_ids(mask):
+    if not mask:
+        return np.empty(0, dtype=np.int64)
+
+    data = np.frombuffer(mask.to_bytes((mask.bit_length() + 7) // 8, "little"), dtype=np.uint8)
+
+    return np.flatnonzero(np.unpackbits(data, bitorder="little"))
+
+
+def get_compact_meta():
+    # Everything but the text, for lazy_bank.LazyBank
+    return get_connection().execute(SQL_SELECT_COMPACT_META).fetchall()
+
+
+def get_content_hash():
+    row = get_connection().execute(
+        "SELECT value FROM bank_meta WHERE key = 'content_hash'"
+    ).fetchone()
+    return row[0] if row else None
+
+
+# ---------------- QUESTION INDEX ----------------
+
+class QuestionIndex:
+    # Immutable id pools per category, difficulty and tier, built once from
+    # the bank metadata. Sampling draws straight from a pool in O(k).
+    __slots__ = ("all_ids", "by_category", "by_difficulty", "by_tier", "by_tier_category", "_masks")
+
+    def __init__(self, meta_rows):
+        by_category = {}
+        by_difficulty = {}
+        by_tier = {TIER_FREE: [], TIER_PRO: []}
+        by_tier_category = {TIER_FREE: {}, TIER_PRO: {}}
+
+        for question_id, category, difficulty, is_pro in meta_rows:
+            tier = TIER_PRO if is_pro else TIER_FREE
+
+            by_category.setdefault(category, []).append(question_id)
+            by_difficulty.setdefault(difficulty, []).append(question_id)
+            by_tier[tier].append(question_id)
+            by_tier_category[tier].setdefault(category, []).append(question_id)
+
+        self.by_category = {k: tuple(v) for k, v in by_category.items()}
+        self.by_difficulty = {k: tuple(v) for k, v in by_difficulty.items()}
+        self.by_tier = {k: tuple(v) for k, v in by_tier.items()}
+        self.by_tier_category = {
+            tier: {k: tuple(v) for k, v in groups.items()}
+            for tier, groups in by_tier_category.items()
+        }
+        self.all_ids = tuple(row[0] for row in meta_rows)
+        self._masks = {}
+
+    def pool(self, tier=None, category=None, difficulty=None):
+        if tier is not None and category is not None:
+            ids = self.by_tier_category[tier].get(category, ())
+        elif tier is not None:
+            ids = self.by_tier[tier]
+        elif category is not None:
+            ids = self.by_category.get(category, ())
+        else:
+            ids = self.all_ids
+
+        if difficulty is not None:
+            wanted = set(self.by_difficulty.get(difficulty, ()))
+            ids = tuple(i for i in ids if i in wanted)
+
+        return ids
+
+    def mask(self, tier=None, category=None, difficulty=None):
+        # Bitset of a pool, built on first use
+        key = (tier, category, difficulty)
+
+        mask = self._masks.get(key)
+        if mask is None:
+            mask = self._masks[key] = ids_to_mask(self.pool(tier, category, difficulty))
+
+        return mask
+
+    def __len__(self):
+        return len(self.all_ids)
+
+    def count(self, tier=None, category=None, difficulty=None):
+        return len(self.pool(tier, category, difficulty))
+
+    def categories(self, tier=None):
+        if tier is None:
+            return self.by_category
+        return self.by_tier_category[tier]
+
+    def counts(self, tier=None):
+        return {category: len(ids) for category, ids in self.categories(tier).items()}
+
+    def sample(self, k, tier=None, category=None, difficulty=None):
+        ids = self.pool(tier, category, difficulty)
+        return random.sample(ids, min(k, len(ids)))
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index():
+    global _index
+
+    index = _index
+    if index is None:
+        with _index_lock:
+            if _index is None:
+                _index = QuestionIndex(get_question_meta())
+            index = _index
+
+    return index
+
+
+def invalidate_index():
+    global _index
+    _index = None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import questions.json into the question bank")
+    parser.add_argument("path", nargs="?", default=QUESTIONS_FILE)
+    parser.add_argument("--force", action="store_true", help="rebuild even if unchanged")
+    args = parser.parse_args()
+
+    if build_bank(args.path, force=args.force):
+        print(f"Question bank rebuilt from {args.path}")
+    else:
+        print("Question bank is up to date")
@@ -1,20 +1,336 @@
-from database import get_questions, save_result
+import itertools
+import struct
+import time
+from array import array
+
+from adaptive import AdaptiveTest
+
+# ---------------- DOMAIN INTERNING ----------------
+# Domains are stored per session as small integers; names live here once.
+DOMAIN_NAMES = []
+_domain_ids = {}
+
+
+def intern_domain(name):
+    domain_id = _domain_ids.get(name)
+
+    if domain_id is None:
+        domain_id = len(DOMAIN_NAMES)
+        _domain_ids[name] = domain_id
+        DOMAIN_NAMES.append(name)
+
+    return domain_id
+
+
+# Answer byte: option index, with CORRECT set when it was right
+UNANSWERED = 0xFF
+CORRECT = 0x80
+OPTION_MASK = 0x7F
+
+# version, session id, mode length, question count, index, time limit (s),
+# elapsed (s)
+_HEADER = struct.Struct("<BIBHHId")
+_FORMAT_VERSION = 2
+
+# Question id array type per format version; version 1 snapshots (uint16
+# ids) still restore
+_ID_TYPES = {1: "H", 2: "I"}
+
+
+class QuizSession:
+    # Compact per-session state: question ids, answers and timings live in
+    # flat arrays, and the question dicts themselves are shared through the
+    # engine's question table.
+    __slots__ = (
+        "id",
+        "mode",
+        "question_ids",
+        "answers",
+        "times",
+        "index",
+        "score",
+        "answered",
+        "domain_correct",
+        "domain_total",
+        "time_limit",
+        "started_at",
+        "shown_at",
+        "adaptive",
+    )
+
+    def __init__(self, session_id, mode, question_ids, time_limit=None):
+        n = len(question_ids)
+        domains = len(DOMAIN_NAMES)
+
+        self.id = session_id
+        self.mode = mode
+        self.question_ids = array("I", question_ids)
+        self.answers = bytearray(b"\xff" * n)
+        self.times = array("d", bytes(8 * n))   # seconds spent on each question
+        self.index = 0
+        self.score = 0
+        self.answered = False
+        self.domain_correct = array("H", bytes(2 * domains))
+        self.domain_total = array("H", bytes(2 * domains))
+        self.time_limit = time_limit
+        self.started_at = time.monotonic()
+        self.shown_at = self.started_at
+        self.adaptive = None    # AdaptiveTest for CAT sessions
+
+    @property
+    def total(self):
+        return len(self.question_ids)
+
+    @property
+    def finished(self):
+        return self.index >= len(self.question_ids)
+
+    @property
+    def percentage(self):
+        return (self.score / self.total) * 100 if self.total else 0
+
+    @property
+    def elapsed(self):
+        return time.monotonic() - self.started_at
+
+    @property
+    def deadline(self):
+        # On the time.monotonic() clock
+        if not self.time_limit:
+            return None
+        return self.started_at + self.time_limit
+
+    @property
+    def remaining(self):
+        if not self.time_limit:
+            return None
+        return max(0.0, self.time_limit - self.elapsed)
+
+    def append(self, question_id):
+        # Adaptive sessions grow one question at a time
+        self.question_ids.append(question_id)
+        self.answers.append(UNANSWERED)
+        self.times.append(0.0)
+
+    def tally(self, domain_id, correct):
+        if domain_id >= len(self.domain_total):
+            grow = bytes(2 * (domain_id + 1 - len(self.domain_total)))
+            self.domain_total.frombytes(grow)
+            self.domain_correct.frombytes(grow)
+
+        self.domain_total[domain_id] += 1
+        if correct:
+            self.score += 1
+            self.domain_correct[domain_id] += 1
+
+    def domain_stats(self):
+        return {
+            DOMAIN_NAMES[domain_id]: {
+                "correct": self.domain_correct[domain_id],
+                "total": total
+            }
+            for domain_id, total in enumerate(self.domain_total)
+            if total
+        }
+
+    def response_rows(self):
+        return [
+            (
+                self.question_ids[i],
+                answer & OPTION_MASK,
+                int(bool(answer & CORRECT)),
+                int(self.times[i] * 1000)
+            )
+            for i, answer in enumerate(self.answers)
+            if answer != UNANSWERED
+        ]
+
+    def to_bytes(self):
+        # About 7 bytes per question: uint32 id, the answer byte, and the
+        # time on the question in uint16 deciseconds. Score and tallies are
+        # rebuilt from the answers when the session is restored.
+        mode = self.mode.encode()
+        times = array("H", (min(int(t * 10), 0xFFFF) for t in self.times))
+
+        header = _HEADER.pack(
+            _FORMAT_VERSION,
+            self.id,
+            len(mode),
+            len(self.question_ids),
+            self.index,
+            self.time_limit or 0,
+            self.elapsed
+        )
+
+        return b"".join((
+            header,
+            mode,
+            self.question_ids.tobytes(),
+            bytes(self.answers),
+            times.tobytes()
+        ))
+
 
 class QuizEngine:
-    def __init__(self):
-        self.questions = get_questions()
-        self.current_index = 0
+    # Owns every active quiz session in the process. Holds no UI state, so
+    # the Flet app, benchmarks and load tests all drive it the same way:
+    # start() -> answer()/advance() per question -> finish().
+    def __init__(self, questions=None):
+        self.sessions = {}
+
+        # Shared id -> question dict table: filled by register_questions(),
+        # or a lazy_bank.LazyBank that already holds the whole bank
+        self.questions = {} if questions is None else questions
+        self._ids = itertools.count(1)
+
+    def register_questions(self, questions):
+        for question in questions:
+            if question["id"] not in self.questions:
+                intern_domain(question["category"])
+                self.questions[question["id"]] = question
 
-    def get_current_question(self):
-        if self.current_index < len(self.questions):
-            return self.questions[self.current_index]
-        return None
+    def start(self, mode, question_ids, time_limit=None):
+        # Only ids: question text is read from the table when each question
+        # is shown, so those ids must be registered (or in the LazyBank)
+        session = QuizSession(next(self._ids), mode, question_ids, time_limit)
+        self.sessions[session.id] = session
 
-    def submit_answer(self, selected_answer):
-        question = self.questions[self.current_index]
-        correct = 1 if selected_answer == question[6] else 0
+        return session
 
-        save_result(question[0], selected_answer, correct)
-        self.current_index += 1
+    def start_adaptive(self, pool, questions, seed=None):
+        # Computerized adaptive test: each next question is picked from the
+        # ItemPool to match the current ability estimate, until the estimate
+        # is precise enough. questions must cover the pool unless the
+        # engine's table already does.
+        self.register_questions(questions)
+
+        session = QuizSession(next(self._ids), "Adaptive", ())
+        session.adaptive = AdaptiveTest(pool, seed)
+
+        question_id = session.adaptive.next_item()
+        if question_id is not None:
+            session.append(question_id)
+
+        self.sessions[session.id] = session
+
+        return session
+
+    def get(self, session_id):
+        return self.sessions.get(session_id)
+
+    def current_question(self, session):
+        if session.finished:
+            return None
+        return self.questions[session.question_ids[session.index]]
+
+    def answer(self, session, selected):
+        # Returns whether the answer was correct, or None if the current
+        # question was already answered (or the session is over)
+        if session.answered or session.finished:
+            return None
+
+        i = session.index
+        question = self.questions[session.question_ids[i]]
+        correct = selected == question["correct_answer"]
+
+        session.answers[i] = selected | CORRECT if correct else selected
+        session.times[i] = time.monotonic() - session.shown_at
+        session.tally(intern_domain(question["category"]), correct)
+        session.answered = True
+
+        if session.adaptive is not None:
+            session.adaptive.record(question["id"], correct)
 
         return correct
+
+    def advance(self, session):
+        session.index += 1
+        session.answered = False
+        session.shown_at = time.monotonic()
+
+        if session.adaptive is not None and session.finished:
+            question_id = session.adaptive.next_item()
+            if question_id is not None:
+                session.append(question_id)
+
+        return self.current_question(session)
+
+    def finish(self, session):
+        self.sessions.pop(session.id, None)
+
+        result = {
+            "mode": session.mode,
+            "score": session.score,
+            "total": session.total,
+            "percentage": session.percentage,
+            "domain_stats": session.domain_stats(),
+            "responses": session.response_rows()
+        }
+
+        if session.adaptive is not None:
+            result["ability"] = session.adaptive.estimate.theta
+            result["se"] = session.adaptive.estimate.se
+            result["readiness"] = session.adaptive.readiness()
+
+        return result
+
+    def abandon(self, session):
+        self.sessions.pop(session.id, None)
+
+    def replay(self, session, i, answer, seconds):
+        # Re-apply a recorded answer byte (from to_bytes() or a journal)
+        question = self.questions[session.question_ids[i]]
+
+        session.answers[i] = answer
+        session.times[i] = seconds
+        session.tally(intern_domain(question["category"]), answer & CORRECT)
+
+    def restore(self, data):
+        # Rebuild a session from QuizSession.to_bytes() under a fresh id. Its
+        # questions must already be registered (see read_header()).
+        header = read_header(data)
+        n = len(header["question_ids"])
+        offset = header["size"]
+
+        answers = data[offset:offset + n]
+        times = array("H")
+        times.frombytes(data[offset + n:offset + 3 * n])
+
+        session = QuizSession(
+            next(self._ids), header["mode"], header["question_ids"], header["time_limit"]
+        )
+        session.index = header["index"]
+        session.started_at = time.monotonic() - header["elapsed"]
+
+        for i, answer in enumerate(answers):
+            if answer != UNANSWERED:
+                self.replay(session, i, answer, times[i] / 10)
+
+        session.answered = not session.finished and session.answers[session.index] != UNANSWERED
+        self.sessions[session.id] = session
+
+        return session
+
+
+def read_header(data):
+    # The fixed part of a QuizSession.to_bytes() snapshot; "size" is where
+    # the answers start
+    (
+        version, session_id, mode_len, n, index, time_limit, elapsed
+    ) = _HEADER.unpack_from(data)
+
+    if version not in _ID_TYPES:
+        raise ValueError(f"unsupported session format {version}")
+
+    offset = _HEADER.size + mode_len
+    question_ids = array(_ID_TYPES[version])
+    question_ids.frombytes(data[offset:offset + question_ids.itemsize * n])
+
+    return {
+        "mode": bytes(data[_HEADER.size:offset]).decode(),
+        "question_ids": question_ids,
+        "index": index,
+        "time_limit": time_limit or None,
+        "elapsed": elapsed,
+        "size": offset + question_ids.itemsize * n
+    }
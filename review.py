@@ -0,0 +1,85 @@
+import time
+
+from database import LOCAL_USER, get_review_states
+
+DAY = 86400
+
+# SM-2 defaults
+INITIAL_EASE = 2.5
+MIN_EASE = 1.3
+
+# A missed question comes back after this many seconds instead of a full
+# day, so it turns up again in the next review session
+RELEARN_DELAY = 600
+
+# Answer time (s) that separates an easy recall from a hesitant one
+FAST_ANSWER = 15
+SLOW_ANSWER = 60
+
+REVIEW_SIZE = 25
+
+
+def quality(correct, seconds):
+    # SM-2 response quality (0-5) from correctness and answer time
+    if not correct:
+        return 2
+    if seconds < FAST_ANSWER:
+        return 5
+    if seconds > SLOW_ANSWER:
+        return 3
+    return 4
+
+
+class ReviewScheduler:
+    # SM-2 state for one user, loaded once and kept in memory, so recording
+    # an answer is a dict update. The caller keeps the rows it returns and
+    # persists them to review_schedule when the session ends (with the
+    # attempt in database.save_attempt, or async_db.queue_reviews).
+    def __init__(self, user_id=LOCAL_USER, states=None):
+        self.user_id = user_id
+        self.states = states if states is not None else {}   # id -> (reps, interval, ease, due)
+
+    @classmethod
+    def load(cls, user_id=LOCAL_USER):
+        return cls(user_id, get_review_states(user_id))
+
+    def record(self, question_id, correct, seconds=0.0, now=None):
+        if now is None:
+            now = time.time()
+
+        repetitions, interval, ease, _ = self.states.get(
+            question_id, (0, 0.0, INITIAL_EASE, now)
+        )
+        q = quality(correct, seconds)
+
+        if q < 3:
+            repetitions = 0
+            interval = 0.0
+            due = now + RELEARN_DELAY
+        else:
+            repetitions += 1
+            if repetitions == 1:
+                interval = 1.0
+            elif repetitions == 2:
+                interval = 6.0
+            else:
+                interval = interval * ease
+            due = now + interval * DAY
+
+        ease = max(MIN_EASE, ease + 0.1 - (5 - q) * (0.08 + (5 - q) * 0.02))
+
+        self.states[question_id] = (repetitions, interval, ease, due)
+
+        return (self.user_id, question_id, repetitions, interval, ease, due)
+
+    def due_count(self, now=None, include=None):
+        # include(question_id) -> bool narrows the count, e.g. to free questions
+        if now is None:
+            now = time.time()
+        return sum(
+            1 for question_id, state in self.states.items()
+            if state[3] <= now and (include is None or include(question_id))
+        )
+
+    def unseen(self, ids):
+        return [question_id for question_id in ids if question_id not in self.states]
@@ -0,0 +1,299 @@
+import os
+import struct
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from quiz_engine import read_header
+
+try:
+    import fcntl
+except ImportError:     # Windows: only journals open in this process are seen as in use
+    fcntl = None
+
+# One file per in-progress timed session, named after the session; removed
+# once it is submitted
+JOURNAL_DIR = "journal"
+JOURNAL_SUFFIX = ".journal"
+
+# Appended answers between fsyncs. Every record reaches the OS straight
+# away, so a killed worker or app loses nothing; only a power cut can lose
+# the unsynced tail.
+FSYNC_EVERY = 10
+
+_MAGIC = b"PMJ1"
+_LENGTH = struct.Struct("<I")
+
+# question index, answer byte, time on question (ds), session elapsed (s)
+RECORD = struct.Struct("<HBHf")
+
+# fsyncs, closes and deletes, in submission order
+_sync_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="journal-sync")
+
+# ---------------- OWNERSHIP ----------------
+# A journal is claimed by whoever has it open for writing: in this process
+# through _claimed, across processes through flock on the open file. Claimed
+# journals are never offered, resumed or deleted by anyone else; the claim
+# ends when the owner's file is closed.
+_claimed = set()
+_claimed_lock = threading.Lock()
+
+
+class JournalInUse(OSError):
+    pass
+
+
+def _claim(path, fd):
+    path = os.path.abspath(path)
+
+    with _claimed_lock:
+        if path in _claimed:
+            return False
+
+        if fcntl is not None:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                return False
+
+        _claimed.add(path)
+        return True
+
+
+def _release(path, fd):
+    os.close(fd)
+
+    with _claimed_lock:
+        _claimed.discard(os.path.abspath(path))
+
+
+def _settle():
+    # Let closes and deletes already handed to _sync_executor finish first
+    _sync_executor.submit(lambda: None).result()
+
+
+class SessionJournal:
+    # Append-only log for one quiz session: a QuizSession.to_bytes()
+    # snapshot taken at start, then one fixed-size record per answer.
+    def __init__(self, path, fd):
+        self.path = path
+        self._fd = fd
+        self._unsynced = 0
+        self._sync = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def create(cls, session, directory=JOURNAL_DIR):
+        os.makedirs(directory, exist_ok=True)
+
+        # Session ids restart with the process, hence the random suffix
+        name = f"{session.mode.lower()}-{session.id}-{uuid.uuid4().hex[:12]}"
+        path = os.path.join(directory, name + JOURNAL_SUFFIX)
+        partial = os.path.join(directory, name + ".partial")
+
+        # Written and claimed under a name pending() ignores, so nobody
+        # sees it before the snapshot is complete
+        fd = os.open(partial, os.O_WRONLY | os.O_CREAT | os.O_EXCL | os.O_APPEND, 0o600)
+        _claim(path, fd)
+
+        snapshot = session.to_bytes()
+        os.write(fd, _MAGIC + _LENGTH.pack(len(snapshot)) + snapshot)
+        os.rename(partial, path)
+
+        journal = cls(path, fd)
+        journal.sync()
+        return journal
+
+    @classmethod
+    def reopen(cls, path):
+        _settle()
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND)
+
+        if not _claim(path, fd):
+            os.close(fd)
+            raise JournalInUse(f"{path} is open in another session")
+
+        return cls(path, fd)
+
+    def record(self, session):
+        # Log the answer to the current question
+        i = session.index
+        os.write(self._fd, RECORD.pack(
+            i,
+            session.answers[i],
+            min(int(session.times[i] * 10), 0xFFFF),
+            session.elapsed
+        ))
+
+        self._unsynced += 1
+        if self._unsynced >= FSYNC_EVERY:
+            self.sync()
+
+    def sync(self):
+        # fsync off the calling thread; the event loop never waits on disk
+        self._unsynced = 0
+        with self._lock:
+            if self._sync is None or self._sync.done():
+                self._sync = _sync_executor.submit(os.fsync, self._fd)
+
+    # close() and discard() return at once; the work runs on _sync_executor
+    # after any fsync in flight, so the event loop never waits on disk
+
+    def close(self):
+        # Keep the file for a later resume
+        fd, self._fd = self._fd, None
+        if fd is not None:
+            return _sync_executor.submit(self._finish, fd, False)
+
+    def discard(self):
+        fd, self._fd = self._fd, None
+        if fd is None:
+            return _sync_executor.submit(_discard, self.path)
+        return _sync_executor.submit(self._finish, fd, True)
+
+    def _finish(self, fd, remove):
+        try:
+            if remove:
+                # Still claimed, so nobody can pick it up meanwhile
+                os.remove(self.path)
+            else:
+                os.fsync(fd)
+        finally:
+            _release(self.path, fd)
+
+
+def discard(path):
+    # Delete an unclaimed journal. False if it is in use (or already gone).
+    _settle()
+    return _discard(path)
+
+
+def _discard(path):
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except FileNotFoundError:
+        return False
+
+    if not _claim(path, fd):
+        os.close(fd)
+        return False
+
+    try:
+        os.remove(path)
+    finally:
+        _release(path, fd)
+
+    return True
+
+
+def read(path):
+    # Returns (snapshot, records). A torn trailing record is ignored.
+    with open(path, "rb") as f:
+        data = f.read()
+
+    if data[:len(_MAGIC)] != _MAGIC:
+        raise ValueError(f"{path} is not a session journal")
+
+    start = len(_MAGIC) + _LENGTH.size
+    (length,) = _LENGTH.unpack_from(data, len(_MAGIC))
+    snapshot = data[start:start + length]
+
+    if len(snapshot) < length:
+        raise ValueError(f"{path} has a truncated snapshot")
+
+    body = data[start + length:]
+    usable = len(body) - len(body) % RECORD.size
+
+    return snapshot, list(RECORD.iter_unpack(body[:usable]))
+
+
+def peek(path):
+    # Header of the journaled session plus progress as of the last record
+    snapshot, records = read(path)
+    header = read_header(snapshot)
+
+    elapsed = records[-1][3] if records else header["elapsed"]
+    header["answered"] = len({record[0] for record in records})
+    header["elapsed"] = elapsed
+
+    if header["time_limit"]:
+        header["remaining"] = max(0.0, header["time_limit"] - elapsed)
+    else:
+        header["remaining"] = None
+
+    return header
+
+
+def _mtime(path):
+    try:
+        return os.path.getmtime(path)
+    except FileNotFoundError:
+        return 0.0
+
+
+def pending(mode, directory=JOURNAL_DIR):
+    # peek() of the newest unclaimed journal for a mode, plus its "path",
+    # or None. Unreadable unclaimed journals are removed.
+    _settle()
+
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return None
+
+    paths = sorted(
+        (os.path.join(directory, name) for name in names if name.endswith(JOURNAL_SUFFIX)),
+        key=_mtime,
+        reverse=True
+    )
+
+    for path in paths:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except FileNotFoundError:
+            continue
+
+        # Held only while looking, so the offer can still be resumed
+        if not _claim(path, fd):
+            os.close(fd)
+            continue
+
+        try:
+            header = peek(path)
+        except (OSError, ValueError, struct.error):
+            os.remove(path)
+            continue
+        finally:
+            _release(path, fd)
+
+        if header["mode"] == mode:
+            header["path"] = path
+            return header
+
+    return None
+
+
+def resume(path, engine):
+    # Restore the session into the engine and reopen its journal for
+    # appending. The session's questions must be registered first. Raises
+    # JournalInUse if another session got to it first, FileNotFoundError if
+    # it was submitted or discarded meanwhile.
+    journal = SessionJournal.reopen(path)
+
+    try:
+        snapshot, records = read(path)
+        session = engine.restore(snapshot)
+
+        for i, answer, deciseconds, elapsed in records:
+            engine.replay(session, i, answer, deciseconds / 10)
+            session.index = max(session.index, i + 1)
+    except BaseException:
+        journal.close()
+        raise
+
+    if records:
+        session.started_at = time.monotonic() - records[-1][3]
+
+    session.answered = False
+    return session, journal
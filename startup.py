@@ -0,0 +1,69 @@
+import asyncio
+import logging
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+# ---------------- STARTUP PIPELINE ----------------
+# Named phases run once per process, in order, on a background thread, so
+# importing the app and serving the splash never wait on them. Pages await
+# ready() and go on as soon as the last phase is done; on a warm process
+# that is immediately. Each phase is timed and logged, so cold starts can
+# be compared across devices and deployments.
+
+
+class Startup:
+    def __init__(self, phases):
+        self.phases = phases        # [(name, fn)]
+        self.timings = {}           # name -> ms, in completion order
+        self.error = None
+
+        self._done = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="startup", daemon=True)
+                self._thread.start()
+
+        return self
+
+    def _run(self):
+        started = time.perf_counter()
+
+        try:
+            for name, fn in self.phases:
+                phase_started = time.perf_counter()
+                fn()
+                self.timings[name] = (time.perf_counter() - phase_started) * 1e3
+                log.info("startup: %-14s %8.1f ms", name, self.timings[name])
+        except BaseException as e:
+            self.error = e
+            log.exception("startup failed in phase %r", name)
+        finally:
+            log.info("startup: %-14s %8.1f ms", "total", (time.perf_counter() - started) * 1e3)
+            self._done.set()
+
+    @property
+    def is_ready(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        self.start()
+
+        if not self._done.wait(timeout):
+            return False
+        if self.error is not None:
+            raise self.error
+
+        return True
+
+    async def ready(self):
+        # Without holding the event loop while a cold process starts up
+        if not self.is_ready:
+            await asyncio.to_thread(self.wait)
+
+        return self.wait()
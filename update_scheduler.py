@@ -0,0 +1,78 @@
+import asyncio
+import logging
+import time
+
+log = logging.getLogger(__name__)
+
+# ---------------- UPDATE SCHEDULER ----------------
+# Handlers mark what changed instead of calling page.update() themselves.
+# Everything marked before the next event-loop tick goes out in one update,
+# and flushes are at least FRAME apart, so a burst of requests (a handler
+# that changes a screen and then rebuilds it, a timer tick landing mid
+# action) costs one round trip in web mode instead of several.
+FRAME = 1 / 60
+
+
+class UpdateScheduler:
+    def __init__(self, page, frame=FRAME):
+        self.page = page
+        self.frame = frame
+
+        self.requested = 0
+        self.flushes = 0
+
+        self._whole_page = False
+        self._controls = {}     # id -> control, so each is sent once
+        self._handle = None
+        self._last_flush = 0.0
+
+    @property
+    def collapsed(self):
+        # Requests that rode along with another one's flush
+        return self.requested - self.flushes
+
+    def request(self, *controls):
+        # Just these controls, or the whole page when none are given
+        self.requested += 1
+
+        if controls:
+            for control in controls:
+                self._controls[id(control)] = control
+        else:
+            self._whole_page = True
+
+        if self._handle is None:
+            loop = asyncio.get_running_loop()
+            delay = self._last_flush + self.frame - time.monotonic()
+
+            if delay > 0:
+                self._handle = loop.call_later(delay, self.flush)
+            else:
+                self._handle = loop.call_soon(self.flush)
+
+    def flush(self):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+        whole_page, controls = self._whole_page, list(self._controls.values())
+        self._whole_page = False
+        self._controls.clear()
+
+        if not whole_page and not controls:
+            return
+
+        self._last_flush = time.monotonic()
+        self.flushes += 1
+
+        if whole_page:
+            self.page.update()
+        else:
+            self.page.update(*controls)
+
+        log.debug("update %d: %d requests so far, %d collapsed",
+                  self.flushes, self.requested, self.collapsed)
+
+    def report(self):
+        log.info("%d update requests sent as %d updates (%d collapsed)",
+                 self.requested, self.flushes, self.collapsed)